@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Backtest the recession indicator model at any as-of dates.
+Run: python backtest.py 2007-06-01 2008-09-01
+     python backtest.py --range 1990-01 2024-12 [--step 3] [--output results.json]
+     python backtest.py --scenarios
+
+All dates are scored in one vectorized batch (scripts/recession_score.py):
+each FRED series is loaded once from the local store (scripts/fred_store.py)
+and every date takes the latest observation on or before it. An input with no
+recent enough observation (e.g. before its series starts) is left out, as are
+PMI and Big Mac, which have no free history; their weight goes to the
+available components. Results, with the observation date used from each
+series, are written to a CSV or JSON file (by extension, default
+.cache/backtest/results.csv). --scenarios checks the hand-built 2007 and 2008
+points against the risk levels the model should give them.
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "scripts"))
+
+import recession_score
+
+DEFAULT_OUTPUT = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "backtest", "results.csv")
+DEFAULT_DATES = ["2007-06-01", "2008-09-01", "2008-12-01"]
+
+# Typical values of the indicators, and the risk level they should produce
+SCENARIOS = {
+    "2007 pre-crisis": {
+        "expected": (40, 70),  # early warning: moderate risk
+        "data": {
+            "yield_curve": {"inverted_rate": 0.4, "avg_spread": -0.2},
+            "pmi": {"avg_value": 51.5, "contraction_rate": 0.15},
+            "credit_spreads": {"avg_spread": 180, "high_risk_rate": 0.15},
+            "consumer_confidence": {"avg_value": -5.0},
+            "unemployment_claims": {"avg_stress": 8.0, "high_risk_rate": 0.1},
+            "big_mac": {"avg_stress": 22.0}
+        }
+    },
+    "2008 crisis": {
+        "expected": (70, 100),  # active crisis: high risk
+        "data": {
+            "yield_curve": {"inverted_rate": 0.8, "avg_spread": -1.5},
+            "pmi": {"avg_value": 38.0, "contraction_rate": 0.95},
+            "credit_spreads": {"avg_spread": 650, "high_risk_rate": 0.9},
+            "consumer_confidence": {"avg_value": -45.0},
+            "unemployment_claims": {"avg_stress": 60.0, "high_risk_rate": 0.8},
+            "big_mac": {"avg_stress": 45.0}
+        }
+    }
+}
+
+
+def risk_level(score):
+    if score is None:
+        return "NO DATA"
+    if score >= 70:
+        return "HIGH RISK"
+    if score >= 40:
+        return "MODERATE RISK"
+    return "LOW RISK"
+
+
+def _number(value, ndigits=1):
+    value = float(value)
+    return None if np.isnan(value) else round(value, ndigits)
+
+
+def date_range(start, end, step=1):
+    """First day of every `step`-th month from start to end (YYYY-MM)"""
+    months = np.arange(np.datetime64(start, "M"), np.datetime64(end, "M") + 1, step)
+    return months.astype("datetime64[D]")
+
+
+def run_backtest(dates):
+    """One result dict per date: score, risk level, component scores and inputs"""
+    dates = np.asarray(dates, dtype="datetime64[D]")
+    inputs, observed = recession_score.inputs_at(dates)
+    scores, components = recession_score.score(inputs)
+
+    results = []
+    for i, date in enumerate(dates):
+        score = _number(scores[i], 0)
+        result = {
+            "date": str(date),
+            "score": int(score) if score is not None else None,
+            "risk": risk_level(score)
+        }
+        result.update({f"{name}_score": _number(values[i]) for name, values in components.items()})
+        result.update({name: _number(values[i], 2) for name, values in inputs.items()})
+        result.update({f"{series_id}_date": None if np.isnat(found[i]) else str(found[i])
+                       for series_id, found in observed.items()})
+        results.append(result)
+    return results
+
+
+def write_results(results, path):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    if path.endswith(".json"):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    else:
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=list(results[0]))
+            writer.writeheader()
+            writer.writerows(results)
+
+
+def print_results(results, limit=40):
+    print(f"{'Date':<12} {'Score':>5}  {'Risk':<14} {'Yield':>6} {'Spread':>6} {'Conf':>6} {'Claims':>6}")
+    print("-" * 64)
+    shown = results if len(results) <= limit else results[:limit // 2] + [None] + results[-limit // 2:]
+    for r in shown:
+        if r is None:
+            print(f"{'...':<12}")
+            continue
+        cells = [r[f"{name}_score"] for name in ("yield", "spreads", "confidence", "claims")]
+        cells = " ".join(f"{c:>6.1f}" if c is not None else f"{'-':>6}" for c in cells)
+        score = r["score"] if r["score"] is not None else "-"
+        print(f"{r['date']:<12} {score:>5}  {r['risk']:<14} {cells}")
+
+
+def run_scenarios():
+    """Score the hand-built scenarios and flag those outside their expected range"""
+    for name, scenario in SCENARIOS.items():
+        score, components = recession_score.score_point(scenario["data"])
+        low, high = scenario["expected"]
+        ok = low <= score < high or (high == 100 and score == 100)
+        parts = ", ".join(f"{component} {value}" for component, value in components.items())
+        print(f"{'PASS' if ok else 'WARNING'}  {name}: {score}/100 {risk_level(score)} "
+              f"(expected {low}-{high})")
+        print(f"      {parts}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backtest the recession model at any as-of dates")
+    parser.add_argument("dates", nargs="*", help="As-of dates (YYYY-MM-DD)")
+    parser.add_argument("--range", nargs=2, metavar=("START", "END"), help="Every month from START to END (YYYY-MM)")
+    parser.add_argument("--step", type=int, default=1, help="Months between dates in --range (default 1)")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="Results file, .csv or .json")
+    parser.add_argument("--scenarios", action="store_true", help="Check the hand-built 2007/2008 scenarios")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("BACKTESTING RECESSION INDICATOR MODEL")
+    print("=" * 70)
+
+    if args.scenarios or not (args.dates or args.range):
+        print("\nScenarios (typical indicator values):")
+        run_scenarios()
+        if args.scenarios and not (args.dates or args.range):
+            return 0
+
+    dates = [np.datetime64(date, "D") for date in args.dates]
+    if args.range:
+        dates.extend(date_range(args.range[0], args.range[1], args.step))
+    if not dates:
+        dates = [np.datetime64(date, "D") for date in DEFAULT_DATES]
+    dates = np.unique(np.array(dates, dtype="datetime64[D]"))
+
+    print(f"\nScoring {len(dates)} dates with FRED data...")
+    try:
+        results = run_backtest(dates)
+    except Exception as e:
+        print(f"Error loading FRED data: {e}", file=sys.stderr)
+        return 1
+
+    print()
+    print_results(results)
+    write_results(results, args.output)
+    print(f"\nResults saved to: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,142 @@
+"""
+Heat Map Generation Benchmark
+Times generate_heatmap_from_options on synthetic option chains of growing size
+Run: python benchmark_heatmap.py [--sizes 1000 10000 100000] [--legacy-limit 10000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fetch_generic_heatmap import generate_heatmap_from_options
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+EXPIRATIONS = 12
+CURRENT_PRICE = 450.0
+
+
+def make_synthetic_chain(contracts, seed=42):
+    """Build a chain of `contracts` options spread over 12 expirations, half calls and half puts"""
+    rng = random.Random(seed)
+    pairs = max(1, contracts // 2)
+    strikes_per_expiration = max(1, pairs // EXPIRATIONS)
+
+    options_data = []
+    for i in range(pairs):
+        expiration = f"2026-{(i // strikes_per_expiration) % EXPIRATIONS + 1:02d}-15"
+        strike = round(CURRENT_PRICE * 0.5 + (i % strikes_per_expiration) * 0.5, 2)
+        for side in ("call", "put"):
+            options_data.append({
+                "expiration": expiration,
+                "strike": strike,
+                "type": side,
+                "volume": rng.randint(0, 5000),
+                "open_interest": rng.randint(0, 20000),
+                "bid": 0,
+                "ask": 0,
+                "last_price": 0,
+                "implied_volatility": 0
+            })
+
+    rng.shuffle(options_data)
+    return options_data
+
+
+def legacy_generate_heatmap(options_data, current_price):
+    """Previous implementation: two linear scans per contract plus a dedupe pass"""
+    heatmap_data = []
+    for option in options_data:
+        strike = option['strike']
+        expiration = option['expiration']
+        call_data = next((o for o in options_data
+                         if o['strike'] == strike
+                         and o['expiration'] == expiration
+                         and o['type'] == 'call'), None)
+        put_data = next((o for o in options_data
+                        if o['strike'] == strike
+                        and o['expiration'] == expiration
+                        and o['type'] == 'put'), None)
+
+        call_volume = call_data['volume'] if call_data else 0
+        put_volume = put_data['volume'] if put_data else 0
+        call_oi = call_data['open_interest'] if call_data else 0
+        put_oi = put_data['open_interest'] if put_data else 0
+
+        if call_volume > 0 or put_volume > 0 or call_oi > 0 or put_oi > 0:
+            heatmap_data.append({
+                "date": expiration,
+                "strike": round(strike, 2),
+                "call_volume": call_volume,
+                "put_volume": put_volume,
+                "call_open_interest": call_oi,
+                "put_open_interest": put_oi,
+                "net_volume": call_volume - put_volume,
+                "net_open_interest": call_oi - put_oi,
+                "total_volume": call_volume + put_volume,
+                "total_open_interest": call_oi + put_oi,
+                "distance_from_price": round(((strike - current_price) / current_price) * 100, 2)
+            })
+
+    seen = set()
+    unique_data = []
+    for item in heatmap_data:
+        key = (item['date'], item['strike'])
+        if key not in seen:
+            seen.add(key)
+            unique_data.append(item)
+
+    unique_data.sort(key=lambda x: (x['date'], x['strike']))
+    return unique_data
+
+
+def time_call(fn, *args):
+    """Run fn(*args) once, returning (seconds, result) with stdout silenced"""
+    stdout = sys.stdout
+    sys.stdout = open(os.devnull, "w")
+    try:
+        start = time.perf_counter()
+        result = fn(*args)
+        elapsed = time.perf_counter() - start
+    finally:
+        sys.stdout.close()
+        sys.stdout = stdout
+    return elapsed, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark heat map generation on synthetic option chains")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="Chain sizes (number of contracts) to benchmark")
+    parser.add_argument("--legacy-limit", type=int, default=10_000,
+                        help="Largest chain to run through the old quadratic implementation (0 disables it)")
+    args = parser.parse_args()
+
+    print(f"{'Contracts':>10} {'Rows':>8} {'Indexed (s)':>12} {'Legacy (s)':>12} {'Speedup':>9}")
+    print("-" * 55)
+
+    for size in args.sizes:
+        options_data = make_synthetic_chain(size)
+        indexed_time, rows = time_call(generate_heatmap_from_options, options_data, CURRENT_PRICE)
+
+        if size <= args.legacy_limit:
+            legacy_time, legacy_rows = time_call(legacy_generate_heatmap, options_data, CURRENT_PRICE)
+            if legacy_rows != rows:
+                print(f"Output mismatch at {size} contracts")
+                return 1
+            legacy_col = f"{legacy_time:12.4f}"
+            speedup_col = f"{legacy_time / indexed_time:8.1f}x" if indexed_time > 0 else f"{'-':>9}"
+        else:
+            legacy_col = f"{'skipped':>12}"
+            speedup_col = f"{'-':>9}"
+
+        print(f"{size:>10,} {len(rows):>8,} {indexed_time:12.4f} {legacy_col} {speedup_col}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
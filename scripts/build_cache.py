@@ -0,0 +1,61 @@
+"""
+Make-style up-to-date checks for derived data files
+A derived file (yield curve, credit spreads) records in metadata.inputs the
+content hashes of the files it was computed from and of the script computing
+it. While they still match, the build is skipped: nothing is recomputed or
+written, so the file and everything downstream of it stays as it is
+Fetched files record the same way a hash of the upstream bodies they were
+built from (http_client.upstream_hashes), so a 304 only skips a rebuild when
+the file on disk really came from those bodies and the current script
+Pass --force to a script (or set BUILD_CACHE=0) to rebuild anyway
+"""
+
+import os
+import sys
+
+import compact_json
+
+INPUTS_KEY = "inputs"
+FORCE = "--force" in sys.argv or os.environ.get("BUILD_CACHE", "1") == "0"
+
+
+def input_hashes(inputs, script=None):
+    """
+    File name -> hash for each input data file (content hash, so a refetch that
+    only changed fetched_at does not count) and the building script (file hash)
+    A missing input hashes to None
+    """
+    hashes = {}
+    for path in inputs:
+        hashes[os.path.basename(path)] = compact_json.file_content_hash(path)
+    if script:
+        hashes.update(script_hashes(script))
+    return hashes
+
+
+def script_hashes(*scripts):
+    """File name -> file hash of each script building an output"""
+    return {os.path.basename(script): compact_json.file_hash(script) for script in scripts}
+
+
+def recorded_hashes(output):
+    """Input hashes stored in a derived file, or None"""
+    try:
+        data = compact_json.read_json(output)
+    except (OSError, ValueError):
+        return None
+    metadata = data.get("metadata") if isinstance(data, dict) else None
+    return metadata.get(INPUTS_KEY) if isinstance(metadata, dict) else None
+
+
+def is_up_to_date(output, hashes):
+    """True when `output` exists and was built from inputs with these hashes"""
+    if FORCE or any(value is None for value in hashes.values()):
+        return False
+    return recorded_hashes(output) == hashes
+
+
+def record(result, hashes):
+    """Store the input hashes in a result's metadata before it is written"""
+    result.setdefault("metadata", {})[INPUTS_KEY] = hashes
+    return result
@@ -0,0 +1,85 @@
+"""
+Data Manifest Builder
+Run: python build_manifest.py (after the fetchers)
+Generates: data/manifest.json
+
+Maps every data file to a content hash, byte sizes, row counts and fetched_at.
+The frontend requests each file as `file?v=<hash>`, so data files can be cached
+indefinitely and only datasets whose hash changed are downloaded again
+"""
+
+import glob
+import os
+from datetime import datetime
+
+import compact_json
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(SCRIPT_DIR, "..", "data")
+MANIFEST_FILE = os.path.join(DATA_DIR, "manifest.json")
+
+
+def row_counts(data):
+    """
+    Rows per top-level section of a decoded data file
+    Lists count their records; dicts of lists (data[year]) count all rows;
+    other dicts (timeseries) count their keys
+    """
+    counts = {}
+    for key, value in data.items():
+        if key == "metadata":
+            continue
+        if isinstance(value, list):
+            counts[key] = len(value)
+        elif isinstance(value, dict):
+            if value and all(isinstance(item, list) for item in value.values()):
+                counts[key] = sum(len(item) for item in value.values())
+            else:
+                counts[key] = len(value)
+    return counts
+
+
+def describe_file(path):
+    """Manifest entry for one data file"""
+    data = compact_json.read_json(path)
+    gz_path = f"{path}.gz"
+    metadata = data.get("metadata", {}) if isinstance(data, dict) else {}
+    return {
+        "hash": compact_json.file_hash(path),
+        "size": os.path.getsize(path),
+        "gzip_size": os.path.getsize(gz_path) if os.path.exists(gz_path) else None,
+        "rows": row_counts(data) if isinstance(data, dict) else {},
+        "fetched_at": metadata.get("fetched_at")
+    }
+
+
+def build_manifest(data_dir=DATA_DIR):
+    files = {}
+    for path in sorted(glob.glob(os.path.join(data_dir, "*.json"))):
+        name = os.path.basename(path)
+        if name == os.path.basename(MANIFEST_FILE):
+            continue
+        try:
+            files[name] = describe_file(path)
+        except (OSError, ValueError) as e:
+            print(f"  Skipping {name}: {e}")
+    return {
+        "metadata": {
+            "fetched_at": datetime.now().isoformat(),
+            "files": len(files)
+        },
+        "files": files
+    }
+
+
+def main():
+    manifest = build_manifest()
+    compact_json.write_json(manifest, MANIFEST_FILE, compress=False)
+
+    print(f"Manifest saved to: {MANIFEST_FILE}")
+    for name, entry in manifest["files"].items():
+        print(f"  {name}: {entry['hash']} ({entry['size'] / 1024:,.0f} KB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,296 @@
+"""
+Columnar compact format for the dashboard JSON files
+Decoded by decodeCompact in src/hooks/useChartData.js back to the legacy shape
+
+Country metrics ({metadata, data: {year: [rows]}, timeseries: {code: ...}}) become:
+  format: "columnar-v1"
+  countries: {code: [...], country: [...], region: [...]}  shared dictionary
+  fields: value columns of each row (e.g. ["value"], ["value", "exports", "imports"])
+  years: keys of `data` in their original order
+  rows: per year, country indices in ranking order
+  values: field -> per year, values aligned with `rows`
+  projection: one "0"/"1" character per year (isProjection bitmask)
+  series: timeseries key order; a country index is rebuilt from data, a code
+          string is stored verbatim in `timeseries` (e.g. the WLD aggregate)
+
+Any other list of same-keyed records anywhere in a file (heat map rows, price
+history, COT reports) becomes {"$columns": {key: [values...]}}
+Files are written without indentation, next to deterministic .json.gz and
+(when the optional brotli package is installed) .json.br siblings
+Writes are atomic (temp file + fsync + rename) and skipped when only
+fetched_at would change
+"""
+
+import gzip
+import hashlib
+import json
+import os
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPACT_FORMAT = "columnar-v1"
+COLUMNS_KEY = "$columns"
+
+# Metadata that changes on every run without the data changing
+VOLATILE_METADATA_KEYS = ("fetched_at",)
+
+
+def _is_scalar(value):
+    return value is None or isinstance(value, (str, int, float, bool))
+
+
+def encode_tables(obj):
+    """Replace every list of same-keyed flat records with a {"$columns": ...} table"""
+    if isinstance(obj, dict):
+        return {key: encode_tables(value) for key, value in obj.items()}
+    if isinstance(obj, list):
+        if len(obj) > 1 and all(isinstance(item, dict) for item in obj):
+            keys = list(obj[0].keys())
+            if all(list(item.keys()) == keys and all(_is_scalar(v) for v in item.values()) for item in obj):
+                return {COLUMNS_KEY: {key: [item[key] for item in obj] for key in keys}}
+        return [encode_tables(item) for item in obj]
+    return obj
+
+
+def decode_tables(obj):
+    if isinstance(obj, dict):
+        if len(obj) == 1 and COLUMNS_KEY in obj:
+            columns = obj[COLUMNS_KEY]
+            keys = list(columns)
+            length = len(columns[keys[0]]) if keys else 0
+            return [{key: columns[key][i] for key in keys} for i in range(length)]
+        return {key: decode_tables(value) for key, value in obj.items()}
+    if isinstance(obj, list):
+        return [decode_tables(item) for item in obj]
+    return obj
+
+
+def _row_fields(row):
+    """Value columns of a data row, or None when the row is not a country row"""
+    keys = list(row.keys())
+    if keys[:2] != ["code", "country"] or keys[-2:] != ["region", "isProjection"]:
+        return None
+    return keys[2:-2]
+
+
+def _rebuild_series(compact):
+    """Country index -> timeseries entry, rebuilt from the per-year rows in one pass"""
+    countries = compact["countries"]
+    series = {}
+    for j in sorted(range(len(compact["years"])), key=lambda j: compact["years"][j]):
+        flag = compact["projection"][j] == "1"
+        for position, i in enumerate(compact["rows"][j]):
+            if i not in series:
+                series[i] = {
+                    "country": countries["country"][i],
+                    "region": countries["region"][i],
+                    "data": []
+                }
+            point = {"year": compact["years"][j]}
+            for field in compact["fields"]:
+                point[field] = compact["values"][field][j][position]
+            point["isProjection"] = flag
+            series[i]["data"].append(point)
+    return series
+
+
+def encode_country_metric(result):
+    """Columnar form of a country metric, or None when `result` does not fit it"""
+    data = result.get("data")
+    timeseries = result.get("timeseries")
+    if not isinstance(data, dict) or not isinstance(timeseries, dict):
+        return None
+    if any(key not in ("metadata", "data", "timeseries") for key in result):
+        return None
+
+    countries = {"code": [], "country": [], "region": []}
+    index = {}
+    fields = None
+    compact = {
+        "format": COMPACT_FORMAT,
+        "metadata": result.get("metadata", {}),
+        "countries": countries,
+        "fields": [],
+        "years": [],
+        "rows": [],
+        "values": {},
+        "projection": "",
+        "series": [],
+        "timeseries": {}
+    }
+
+    projection = []
+    for year, rows in data.items():
+        if not isinstance(rows, list):
+            return None
+        year_rows = []
+        flags = set()
+        for row in rows:
+            row_fields = _row_fields(row) if isinstance(row, dict) else None
+            if row_fields is None or (fields is not None and row_fields != fields):
+                return None
+            fields = row_fields
+
+            code = row["code"]
+            if code not in index:
+                index[code] = len(countries["code"])
+                countries["code"].append(code)
+                countries["country"].append(row["country"])
+                countries["region"].append(row["region"])
+            i = index[code]
+            if countries["country"][i] != row["country"] or countries["region"][i] != row["region"]:
+                return None
+            year_rows.append(i)
+            flags.add(bool(row["isProjection"]))
+
+        # isProjection is stored per year, so it must not vary within one
+        if len(flags) > 1:
+            return None
+        for field in fields or []:
+            column = compact["values"].setdefault(field, [[] for _ in compact["years"]])
+            column.append([row[field] for row in rows])
+        compact["years"].append(year)
+        compact["rows"].append(year_rows)
+        projection.append("1" if flags == {True} else "0")
+
+    compact["fields"] = fields or []
+    compact["projection"] = "".join(projection)
+
+    # Series that match the per-year rows are rebuilt on load; the rest are kept verbatim
+    rebuilt = _rebuild_series(compact)
+    for code, entry in timeseries.items():
+        if code in index and rebuilt.get(index[code]) == entry:
+            compact["series"].append(index[code])
+        else:
+            compact["series"].append(code)
+            compact["timeseries"][code] = entry
+
+    return compact
+
+
+def decode_country_metric(compact):
+    countries = compact["countries"]
+    data = {}
+    for j, year in enumerate(compact["years"]):
+        flag = compact["projection"][j] == "1"
+        rows = []
+        for position, i in enumerate(compact["rows"][j]):
+            row = {"code": countries["code"][i], "country": countries["country"][i]}
+            for field in compact["fields"]:
+                row[field] = compact["values"][field][j][position]
+            row["region"] = countries["region"][i]
+            row["isProjection"] = flag
+            rows.append(row)
+        data[year] = rows
+
+    rebuilt = _rebuild_series(compact)
+    timeseries = {}
+    for item in compact["series"]:
+        if isinstance(item, str):
+            timeseries[item] = compact["timeseries"][item]
+        else:
+            timeseries[countries["code"][item]] = rebuilt[item]
+
+    return {"metadata": compact["metadata"], "data": data, "timeseries": timeseries}
+
+
+def encode(result):
+    """Compact form of any dashboard file"""
+    compact = encode_country_metric(result)
+    if compact is not None:
+        return compact
+    return encode_tables(result)
+
+
+def decode(obj):
+    """Legacy shape of a file written by encode (plain files pass through)"""
+    if isinstance(obj, dict) and obj.get("format") == COMPACT_FORMAT:
+        return decode_country_metric(obj)
+    return decode_tables(obj)
+
+
+def content_hash(encoded):
+    """SHA-256 of an encoded payload, ignoring volatile metadata such as fetched_at"""
+    stable = encoded
+    if isinstance(encoded, dict) and isinstance(encoded.get("metadata"), dict):
+        stable = dict(encoded)
+        stable["metadata"] = {key: value for key, value in encoded["metadata"].items()
+                              if key not in VOLATILE_METADATA_KEYS}
+    text = json.dumps(stable, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def file_content_hash(path):
+    """content_hash of a file on disk, or None when it is missing or unreadable"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return content_hash(json.load(f))
+    except (OSError, ValueError):
+        return None
+
+
+def file_hash(path, length=16):
+    """Version of a data file: SHA-256 prefix of the bytes that are served"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:length]
+
+
+def write_atomic(path, payload):
+    """Write bytes to a temp file, fsync it and rename it over `path`"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def write_compressed(path, payload):
+    """
+    Write path.gz and path.br for an already encoded payload (bytes)
+    Byte-identical for identical input: gzip mtime is 0 and no file name is stored
+    """
+    write_atomic(f"{path}.gz", gzip.compress(payload, compresslevel=9, mtime=0))
+
+    br_path = f"{path}.br"
+    if brotli is not None:
+        write_atomic(br_path, brotli.compress(payload, quality=11))
+    elif os.path.exists(br_path):
+        os.remove(br_path)  # would be stale otherwise
+
+
+def _siblings_exist(path):
+    return os.path.exists(f"{path}.gz") and (brotli is None or os.path.exists(f"{path}.br"))
+
+
+def write_json(result, path, compress=True, verbose=True):
+    """
+    Atomically write a dashboard file in the compact format, plus its compressed
+    siblings unless compress is False
+    Nothing is written when the content (ignoring fetched_at) matches the file
+    already on disk, so unchanged data leaves no git diff
+    Returns True when the file was written
+    """
+    encoded = encode(result)
+    if (not compress or _siblings_exist(path)) and file_content_hash(path) == content_hash(encoded):
+        if verbose:
+            print(f"Content unchanged, keeping {os.path.basename(path)}")
+        return False
+
+    payload = json.dumps(encoded, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    write_atomic(path, payload)
+    if compress:
+        write_compressed(path, payload)
+    return True
+
+
+def read_json(path):
+    """Read a dashboard file back in the legacy shape, whichever format it was written in"""
+    with open(path, "r", encoding="utf-8") as f:
+        return decode(json.load(f))
@@ -1,19 +1,25 @@
 """
 Fetch all heatmap data for all instruments
+Run: python fetch_all_heatmaps.py [--workers 4] [--timeout 900] [--only gold sp500]
+Each instrument runs in its own process, so a failure or hang cannot stall the others
 """
 
+import argparse
+import multiprocessing
 import os
 import sys
+import time
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from fetch_generic_heatmap import fetch_instrument_data
+from fetch_generic_heatmap import fetch_instrument_data, history_log_path
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 
 # All instruments configuration
 instruments = [
     {
+        'id': 'gold',
         'instrument_name': 'Gold',
         'futures_symbol': 'GC=F',
         'etf_symbol': 'GLD',
@@ -24,6 +30,7 @@ instruments = [
         'scale_factor': 10
     },
     {
+        'id': 'silver',
         'instrument_name': 'Silver',
         'futures_symbol': 'SI=F',
         'etf_symbol': 'SLV',
@@ -34,6 +41,7 @@ instruments = [
         'scale_factor': 1
     },
     {
+        'id': 'copper',
         'instrument_name': 'Copper',
         'futures_symbol': 'HG=F',
         'etf_symbol': 'CPER',
@@ -44,6 +52,7 @@ instruments = [
         'scale_factor': 1
     },
     {
+        'id': 'sp500',
         'instrument_name': 'S&P 500',
         'futures_symbol': 'ES=F',
         'etf_symbol': 'SPY',
@@ -54,6 +63,7 @@ instruments = [
         'scale_factor': 10  # SPY is ~1/10 of S&P 500 futures
     },
     {
+        'id': 'nasdaq',
         'instrument_name': 'Nasdaq 100',
         'futures_symbol': 'NQ=F',
         'etf_symbol': 'QQQ',
@@ -64,6 +74,7 @@ instruments = [
         'scale_factor': 40  # QQQ is ~1/40 of Nasdaq 100 futures
     },
     {
+        'id': 'nikkei',
         'instrument_name': 'Nikkei 225',
         'futures_symbol': '^N225',
         'etf_symbol': 'EWJ',
@@ -74,6 +85,7 @@ instruments = [
         'scale_factor': 622  # EWJ is ~1/622 of Nikkei 225
     },
     {
+        'id': 'dax',
         'instrument_name': 'DAX',
         'futures_symbol': '^GDAXI',
         'etf_symbol': 'EWG',
@@ -85,32 +97,133 @@ instruments = [
     }
 ]
 
-if __name__ == "__main__":
-    print("=" * 80)
-    print("FETCHING ALL INSTRUMENTS HEATMAP DATA")
-    print("=" * 80)
+DEFAULT_WORKERS = 4
+DEFAULT_TIMEOUT = 900  # seconds per instrument
+
+
+def run_instrument(config):
+    """Child process entry point: exit code 0 on success"""
+    sys.exit(0 if fetch_instrument_data(config) else 1)
+
+
+def written_paths(config):
+    """
+    Every file an instrument writes: the output and history views with their
+    .gz/.br copies, and the .jsonl history log
+    """
+    paths = [history_log_path(config['history_file'])]
+    for path in (config['output_file'], config['history_file']):
+        paths.extend([path, f"{path}.gz", f"{path}.br"])
+    return paths
+
+
+def output_size_since(config, started_at):
+    """
+    Total size of the instrument's files modified since started_at; a rewritten
+    or appended file counts in full (its size, not the bytes this run added)
+    """
+    total = 0
+    for path in written_paths(config):
+        try:
+            if os.path.getmtime(path) >= started_at:
+                total += os.path.getsize(path)
+        except OSError:
+            continue
+    return total
+
+
+def fetch_instruments_parallel(configs, workers=DEFAULT_WORKERS, timeout=DEFAULT_TIMEOUT):
+    """
+    Fetch several instruments with at most `workers` running at once
+    Instruments still running after `timeout` seconds are terminated
+    Returns one result dict per config, in input order
+    """
+    queue = list(configs)
+    running = {}
+    results = {}
+
+    while queue or running:
+        while queue and len(running) < workers:
+            config = queue.pop(0)
+            process = multiprocessing.Process(target=run_instrument, args=(config,), name=config['id'])
+            started_at = time.time()
+            process.start()
+            running[config['id']] = (process, config, started_at, time.monotonic())
+
+        time.sleep(0.2)
 
-    success_count = 0
-    failed = []
+        for key, (process, config, started_at, start) in list(running.items()):
+            elapsed = time.monotonic() - start
+            if process.is_alive():
+                if elapsed <= timeout:
+                    continue
+                print(f"✗ {config['instrument_name']} timed out after {timeout}s, terminating")
+                process.terminate()
+                process.join(5)
+                if process.is_alive():
+                    process.kill()
+                status = "timeout"
+            else:
+                status = "ok" if process.exitcode == 0 else "failed"
 
-    for config in instruments:
-        print(f"\n{'=' * 80}")
-        print(f"Fetching {config['instrument_name']}...")
-        print(f"{'=' * 80}")
+            process.join()
+            del running[key]
+            results[key] = {
+                "id": key,
+                "instrument_name": config['instrument_name'],
+                "status": status,
+                "seconds": elapsed,
+                "output_bytes": output_size_since(config, started_at)
+            }
+            marker = "✓" if status == "ok" else "✗"
+            print(f"{marker} {config['instrument_name']} {status} in {elapsed:.1f}s")
 
-        if fetch_instrument_data(config):
-            success_count += 1
-            print(f"✓ {config['instrument_name']} completed successfully")
-        else:
-            failed.append(config['instrument_name'])
-            print(f"✗ {config['instrument_name']} failed")
+    return [results[config['id']] for config in configs]
 
+
+def print_summary(results):
+    """Print per-instrument wall time and size of the files written"""
     print(f"\n{'=' * 80}")
     print(f"SUMMARY")
     print(f"{'=' * 80}")
-    print(f"Successfully fetched: {success_count}/{len(instruments)}")
+    print(f"{'Instrument':<14} {'Status':<8} {'Time (s)':>9} {'Output size':>14}")
+    print("-" * 48)
+    for result in results:
+        print(f"{result['instrument_name']:<14} {result['status']:<8} {result['seconds']:>9.1f} {result['output_bytes']:>14,}")
+    print("-" * 48)
+
+    succeeded = [r for r in results if r['status'] == "ok"]
+    failed = [r['instrument_name'] for r in results if r['status'] != "ok"]
+    print(f"Successfully fetched: {len(succeeded)}/{len(results)}")
 
     if failed:
         print(f"Failed: {', '.join(failed)}")
     else:
         print("All instruments fetched successfully!")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fetch heat map data for all instruments")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help=f"Instruments fetched in parallel (default {DEFAULT_WORKERS})")
+    parser.add_argument("--timeout", type=int, default=DEFAULT_TIMEOUT,
+                        help=f"Seconds before an instrument is terminated (default {DEFAULT_TIMEOUT})")
+    parser.add_argument("--only", nargs="+", choices=[c['id'] for c in instruments], metavar="ID",
+                        help=f"Subset of instruments to fetch ({', '.join(c['id'] for c in instruments)})")
+    args = parser.parse_args()
+
+    selected = [c for c in instruments if not args.only or c['id'] in args.only]
+
+    print("=" * 80)
+    print("FETCHING ALL INSTRUMENTS HEATMAP DATA")
+    print("=" * 80)
+    print(f"Instruments: {', '.join(c['instrument_name'] for c in selected)} ({max(1, args.workers)} workers)")
+
+    results = fetch_instruments_parallel(selected, workers=max(1, args.workers), timeout=args.timeout)
+    print_summary(results)
+
+    return 0 if all(r['status'] == "ok" for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
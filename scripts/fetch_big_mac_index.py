@@ -6,11 +6,11 @@ Rising prices relative to local wages signal reduced purchasing power during rec
 Data source: The Economist (CC BY 4.0)
 """
 
-import json
 import sys
 from pathlib import Path
 from datetime import datetime
-import requests
+import compact_json
+import http_client
 import csv
 from io import StringIO
 
@@ -57,9 +57,7 @@ def fetch_big_mac_csv():
 
     print(f"Fetching Big Mac Index data from The Economist GitHub...")
     try:
-        response = requests.get(url, timeout=30)
-        response.raise_for_status()
-        return response.text
+        return http_client.get_text(url)
     except Exception as e:
         print(f"Error fetching data: {e}", file=sys.stderr)
         return None
@@ -180,8 +178,7 @@ def main():
 
     # Save to file
     output_file = Path(__file__).parent.parent / 'data' / 'big_mac_index_data.json'
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(output, f, indent=2, ensure_ascii=False)
+    compact_json.write_json(output, output_file)
 
     print(f"\n[OK] Big Mac Index data saved to {output_file}")
 
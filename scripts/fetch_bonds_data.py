@@ -3,9 +3,10 @@ Government Bond Yields Data Fetcher
 Uses investpy to fetch bond yields from Investing.com
 """
 
-import json
 import os
+import sys
 from datetime import datetime, timedelta
+import compact_json
 
 try:
     import investpy
@@ -15,6 +16,7 @@ except ImportError:
     subprocess.check_call(['pip', 'install', 'investpy'])
     import investpy
 
+import fixtures
 from country_mappings import COUNTRY_NAMES, REGIONS, CURRENT_YEAR
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -109,7 +111,8 @@ def fetch_bonds_data():
 
     # Get list of countries with bond data
     try:
-        countries_with_bonds = investpy.bonds.get_bond_countries()
+        countries_with_bonds = fixtures.call("investpy", ("get_bond_countries",),
+                                             investpy.bonds.get_bond_countries)
     except Exception as e:
         print(f"Error getting bond countries: {e}")
         return None
@@ -145,7 +148,8 @@ def fetch_bonds_data():
 
         try:
             # Get bonds overview for the country
-            bonds_overview = investpy.bonds.get_bonds_overview(country)
+            bonds_overview = fixtures.call("investpy", ("get_bonds_overview", country),
+                                           lambda: investpy.bonds.get_bonds_overview(country))
 
             if bonds_overview is None or bonds_overview.empty:
                 continue
@@ -224,10 +228,13 @@ def main():
 
         if data is None:
             print("Failed to fetch data")
-            return
+            return 1
+        if not data["timeseries"] or not any(data["data"].values()):
+            # Keep the previous file rather than replacing it with an empty dataset
+            print("No bond yields retrieved", file=sys.stderr)
+            return 1
 
-        with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        compact_json.write_json(data, OUTPUT_FILE)
 
         print(f"\nData saved to: {OUTPUT_FILE}")
         print(f"Total countries: {len(data['timeseries'])}")
@@ -242,7 +249,9 @@ def main():
         print(f"Error: {e}")
         import traceback
         traceback.print_exc()
+        return 1
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
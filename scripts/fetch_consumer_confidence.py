@@ -6,11 +6,13 @@ Declining confidence typically precedes reduced consumer spending.
 Data source: FRED - OECD Composite Consumer Confidence Index
 """
 
-import json
 import sys
 from pathlib import Path
 from datetime import datetime
-import requests
+import build_cache
+import compact_json
+import fred_store
+import http_client
 
 # FRED Series IDs for Consumer Confidence by country
 FRED_SERIES = {
@@ -54,58 +56,32 @@ REGION_MAP = {
 }
 
 def fetch_fred_series(series_id):
-    """Fetch current data from FRED."""
-    url = f'https://fred.stlouisfed.org/graph/fredgraph.csv?id={series_id}'
-
+    """Fetch observations from the local FRED store, refreshed with the latest ones."""
     try:
-        response = requests.get(url, timeout=30)
-        response.raise_for_status()
-        return response.text
+        return fred_store.get_series(series_id)
     except Exception as e:
         print(f"Error fetching {series_id}: {e}", file=sys.stderr)
         return None
 
-def parse_fred_csv(csv_text):
-    """Parse FRED CSV format and get latest value."""
-    lines = csv_text.strip().split('\n')
-    if len(lines) < 2:
-        return None
-
-    data_lines = lines[1:]
-
-    # Get the last valid data point
-    for line in reversed(data_lines):
-        parts = line.split(',')
-        if len(parts) != 2:
-            continue
-
-        date, value = parts
-        if value == '.' or value == '':
-            continue
-
-        try:
-            return {'date': date, 'value': float(value)}
-        except ValueError:
-            continue
-
-    return None
-
 def main():
     print("Fetching Consumer Confidence data from FRED...")
 
+    # Download every series concurrently; they are then read in FRED_SERIES order
+    fred_store.prefetch(FRED_SERIES.values())
+
     current_values = []
 
     for country_code, series_id in FRED_SERIES.items():
         print(f"Fetching {COUNTRY_NAMES[country_code]}...")
 
-        csv_data = fetch_fred_series(series_id)
-        if not csv_data:
+        observations = fetch_fred_series(series_id)
+        if observations is None:
             continue
 
-        latest = parse_fred_csv(csv_data)
-        if not latest:
+        if not observations:
             print(f"  No data for {country_code}")
             continue
+        latest = observations[-1]
 
         latest_value = latest['value']
         sentiment = 'negative' if latest_value < 100 else 'positive'
@@ -143,8 +119,16 @@ def main():
     }
 
     output_file = Path(__file__).parent.parent / 'data' / 'consumer_confidence_data.json'
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(output, f, indent=2, ensure_ascii=False)
+    series_urls = fred_store.fetched_urls(FRED_SERIES.values())
+    try:
+        hashes = http_client.upstream_hashes(series_urls, __file__)
+        http_client.skip_if_unchanged(series_urls, output_file, hashes)
+    except http_client.UpstreamUnchanged as e:
+        print(e)
+        return 0
+
+    build_cache.record(output, hashes)
+    compact_json.write_json(output, output_file)
 
     print(f"\n[OK] Consumer Confidence data saved to {output_file}")
     print("\n" + "="*60)
@@ -3,10 +3,13 @@ Corporate Bond Yields Data Fetcher
 Fetches Investment Grade and High Yield corporate bond indices from FRED
 """
 
-import requests
-import json
 import os
+import sys
 from datetime import datetime
+import build_cache
+import compact_json
+import fred_store
+import http_client
 from country_mappings import CURRENT_YEAR
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -159,34 +162,12 @@ FRED_SERIES = {
 
 
 def fetch_fred_series(series_id):
-    """Fetch data from FRED text file"""
-    url = f"https://fred.stlouisfed.org/graph/fredgraph.csv?id={series_id}"
-
+    """Observations of a FRED series from the local store, refreshed with the latest ones"""
     try:
-        response = requests.get(url, timeout=30)
-        response.raise_for_status()
-
-        lines = response.text.strip().split('\n')
-        if len(lines) < 2:
+        data = fred_store.get_series(series_id)
+        if not data:
             return None
-
-        # Parse CSV (skip header)
-        data = []
-        for line in lines[1:]:
-            parts = line.split(',')
-            if len(parts) >= 2:
-                date = parts[0]
-                value = parts[1]
-                if value and value != '.':
-                    try:
-                        data.append({
-                            "date": date,
-                            "value": round(float(value), 3)
-                        })
-                    except ValueError:
-                        continue
-
-        return data
+        return [{"date": d["date"], "value": round(d["value"], 3)} for d in data]
     except Exception as e:
         print(f"  Error fetching {series_id}: {e}")
         return None
@@ -216,6 +197,9 @@ def fetch_corporate_bonds_data():
         "timeseries": {}
     }
 
+    # Download every series concurrently; they are then read in FRED_SERIES order
+    fred_store.prefetch(info["series_id"] for info in FRED_SERIES.values())
+
     for code, info in FRED_SERIES.items():
         print(f"  Fetching {info['name']} ({info['series_id']})...")
 
@@ -272,9 +256,18 @@ def fetch_corporate_bonds_data():
 def main():
     try:
         data = fetch_corporate_bonds_data()
+        if not data["timeseries"]:
+            # Keep the previous file rather than replacing it with an empty dataset
+            print("No series retrieved", file=sys.stderr)
+            return 1
+
+        series_ids = [info["series_id"] for info in FRED_SERIES.values()]
+        series_urls = fred_store.fetched_urls(series_ids)
+        hashes = http_client.upstream_hashes(series_urls, __file__)
+        http_client.skip_if_unchanged(series_urls, OUTPUT_FILE, hashes)
 
-        with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        build_cache.record(data, hashes)
+        compact_json.write_json(data, OUTPUT_FILE)
 
         print(f"\nData saved to: {OUTPUT_FILE}")
         print(f"Total series: {len(data['timeseries'])}")
@@ -285,11 +278,15 @@ def main():
             for item in items:
                 print(f"    {item['name']}: {item['value']}%")
 
+    except http_client.UpstreamUnchanged as e:
+        print(e)
     except Exception as e:
         print(f"Error: {e}")
         import traceback
         traceback.print_exc()
+        return 1
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
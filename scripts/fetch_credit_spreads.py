@@ -5,32 +5,32 @@ Credit spread = Corporate bond yield - Government bond yield
 Widening spreads indicate increased credit risk and potential recession.
 """
 
-import json
 import sys
 from pathlib import Path
 from datetime import datetime
+import build_cache
+import compact_json
+
+DATA_DIR = Path(__file__).parent.parent / 'data'
+BONDS_FILE = DATA_DIR / 'bonds_data.json'
+CORP_BONDS_FILE = DATA_DIR / 'corporate_bonds_data.json'
+OUTPUT_FILE = DATA_DIR / 'credit_spreads_data.json'
 
 def load_bonds_data():
     """Load existing government bonds data."""
-    bonds_file = Path(__file__).parent.parent / 'data' / 'bonds_data.json'
-
-    if not bonds_file.exists():
-        print(f"Error: {bonds_file} not found. Run fetch_bonds_data.py first.", file=sys.stderr)
+    if not BONDS_FILE.exists():
+        print(f"Error: {BONDS_FILE} not found. Run fetch_bonds_data.py first.", file=sys.stderr)
         sys.exit(1)
 
-    with open(bonds_file, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return compact_json.read_json(BONDS_FILE)
 
 def load_corporate_bonds_data():
     """Load existing corporate bonds data."""
-    corp_bonds_file = Path(__file__).parent.parent / 'data' / 'corporate_bonds_data.json'
-
-    if not corp_bonds_file.exists():
-        print(f"Error: {corp_bonds_file} not found. Run fetch_corporate_bonds_data.py first.", file=sys.stderr)
+    if not CORP_BONDS_FILE.exists():
+        print(f"Error: {CORP_BONDS_FILE} not found. Run fetch_corporate_bonds_data.py first.", file=sys.stderr)
         sys.exit(1)
 
-    with open(corp_bonds_file, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return compact_json.read_json(CORP_BONDS_FILE)
 
 def calculate_credit_spreads(bonds_data, corp_bonds_data):
     """Calculate credit spreads by comparing corporate and government bonds."""
@@ -137,6 +137,11 @@ def build_output_structure(spreads):
     return output
 
 def main():
+    inputs = build_cache.input_hashes([BONDS_FILE, CORP_BONDS_FILE], __file__)
+    if build_cache.is_up_to_date(OUTPUT_FILE, inputs):
+        print(f"[OK] Inputs unchanged, keeping {OUTPUT_FILE}")
+        return 0
+
     print("Loading government bonds data...")
     bonds_data = load_bonds_data()
 
@@ -153,13 +158,12 @@ def main():
     print(f"Calculated spreads for {len(spreads)} series")
 
     output = build_output_structure(spreads)
+    build_cache.record(output, inputs)
 
     # Save to file
-    output_file = Path(__file__).parent.parent / 'data' / 'credit_spreads_data.json'
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(output, f, indent=2, ensure_ascii=False)
+    compact_json.write_json(output, OUTPUT_FILE)
 
-    print(f"\n[OK] Credit spreads data saved to {output_file}")
+    print(f"\n[OK] Credit spreads data saved to {OUTPUT_FILE}")
 
     # Print summary
     print("\n" + "="*60)
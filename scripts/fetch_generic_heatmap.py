@@ -5,6 +5,7 @@ Fetches futures prices and real options data from Yahoo Finance and COT data fro
 
 import json
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 import pandas as pd
 
@@ -18,11 +19,24 @@ except ImportError:
     import yfinance as yf
     import requests
 
+import compact_json
+import fixtures
+import http_client
+
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 
 # CFTC COT Report API
 CFTC_API_BASE = "https://publicreporting.cftc.gov/resource"
 
+# Options chain fetching (overridable per instrument through the config)
+OPTIONS_MAX_EXPIRATIONS = 12
+OPTIONS_MAX_WORKERS = 6
+OPTIONS_REQUEST_TIMEOUT = 30
+OPTIONS_RETRIES = 2
+
+# Weekly history snapshots kept (52 weeks)
+HISTORY_MAX_SNAPSHOTS = 52
+
 
 def fetch_cot_data(cftc_code, instrument_name):
     """
@@ -44,10 +58,7 @@ def fetch_cot_data(cftc_code, instrument_name):
             "$limit": 52
         }
 
-        response = requests.get(url, params=params, timeout=30)
-        response.raise_for_status()
-
-        cot_data = response.json()
+        cot_data = http_client.get_json(url, params=params, description=f"COT {cftc_code}")
 
         if not cot_data:
             print("No COT data returned")
@@ -90,7 +101,8 @@ def fetch_futures_prices(futures_symbol, instrument_name):
     try:
         # Fetch 6 months of data
         ticker = yf.Ticker(futures_symbol)
-        hist = ticker.history(period="6mo")
+        hist = fixtures.call("yfinance", ("history", futures_symbol, "6mo"),
+                             lambda: ticker.history(period="6mo"))
 
         if hist.empty:
             print("No data returned from Yahoo Finance")
@@ -119,18 +131,108 @@ def fetch_futures_prices(futures_symbol, instrument_name):
         return None, None
 
 
-def fetch_real_options_data(etf_symbol, instrument_name):
+# Option chain columns (Yahoo Finance name -> output name), NaN filled with 0
+OPTION_INT_COLUMNS = {
+    "volume": "volume",
+    "openInterest": "open_interest"
+}
+OPTION_FLOAT_COLUMNS = {
+    "bid": "bid",
+    "ask": "ask",
+    "lastPrice": "last_price",
+    "impliedVolatility": "implied_volatility"
+}
+
+
+def chain_frame_to_records(frame, expiration, option_type):
+    """
+    Convert one option chain frame (calls or puts) to options_data records
+    Fills NaNs, casts dtypes and tags the side column-wise, then emits all rows at once
+    """
+    if frame is None or frame.empty:
+        return []
+
+    columns = {
+        "expiration": expiration,
+        "strike": frame["strike"].astype("float64"),
+        "type": option_type
+    }
+    for source, target in OPTION_INT_COLUMNS.items():
+        columns[target] = frame[source].fillna(0).astype("int64")
+    for source, target in OPTION_FLOAT_COLUMNS.items():
+        columns[target] = frame[source].fillna(0).astype("float64")
+
+    return pd.DataFrame(columns, index=frame.index).to_dict("records")
+
+
+def option_chain_frames(ticker, expiration):
+    """(calls, puts) frames of one expiration (plain tuple, so fixtures can pickle it)"""
+    opt_chain = ticker.option_chain(expiration)
+    return opt_chain.calls, opt_chain.puts
+
+
+def ticker_with_timeout(symbol, timeout):
+    """
+    yf.Ticker whose HTTP requests each give up after `timeout` seconds
+    option_chain() takes no timeout, so it is set on yfinance's own session
+    (keeping its browser impersonation); the request then fails on its own
+    instead of leaving a hung thread behind
+    """
+    session = yf.Ticker(symbol).session
+    send = session.request
+
+    def request(method, url, **kwargs):
+        kwargs["timeout"] = min(kwargs.get("timeout") or timeout, timeout)
+        return send(method, url, **kwargs)
+
+    session.request = request
+    return yf.Ticker(symbol, session=session)
+
+
+def fetch_option_chains(ticker, expirations, max_workers):
+    """
+    Fetch option chains for several expirations on a bounded thread pool
+    Returns ({expiration: records}, [failed expirations]); requests are bounded
+    by the ticker's session timeout (ticker_with_timeout), so a hung request
+    fails and is reported like any other error
+    """
+    results = {}
+    failed = []
+
+    def fetch_one(expiration):
+        print(f"Fetching options for expiration: {expiration}")
+        calls, puts = fixtures.call("yfinance", ("option_chain", ticker.ticker, expiration),
+                                    lambda: option_chain_frames(ticker, expiration))
+        # Convert each side with whole-column operations
+        return (chain_frame_to_records(calls, expiration, "call")
+                + chain_frame_to_records(puts, expiration, "put"))
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = {executor.submit(fetch_one, expiration): expiration for expiration in expirations}
+        for future in as_completed(futures):
+            expiration = futures[future]
+            try:
+                results[expiration] = future.result()
+            except Exception as e:
+                print(f"Error fetching options for {expiration}: {e}")
+                failed.append(expiration)
+
+    return results, failed
+
+
+def fetch_real_options_data(etf_symbol, instrument_name, max_workers=OPTIONS_MAX_WORKERS,
+                            timeout=OPTIONS_REQUEST_TIMEOUT, retries=OPTIONS_RETRIES):
     """
     Fetch real options data from Yahoo Finance
-    Returns options chain data for the given ETF
+    Returns options chain data for the given ETF, ordered by expiration
     """
     print(f"Fetching real options data for {etf_symbol} ({instrument_name}) from Yahoo Finance...")
 
     try:
-        ticker = yf.Ticker(etf_symbol)
+        ticker = ticker_with_timeout(etf_symbol, timeout)
 
         # Get available expiration dates
-        expirations = ticker.options
+        expirations = fixtures.call("yfinance", ("options", etf_symbol), lambda: ticker.options)
 
         if not expirations:
             print("No options expiration dates found")
@@ -138,47 +240,25 @@ def fetch_real_options_data(etf_symbol, instrument_name):
 
         print(f"Found {len(expirations)} expiration dates")
 
-        all_options_data = []
+        # Fetch options for multiple expiration dates concurrently
+        expirations = list(expirations[:OPTIONS_MAX_EXPIRATIONS])
+        chains, failed = fetch_option_chains(ticker, expirations, max_workers)
 
-        # Fetch options for multiple expiration dates (up to 12)
-        for expiration in expirations[:12]:
-            try:
-                print(f"Fetching options for expiration: {expiration}")
-                opt_chain = ticker.option_chain(expiration)
-
-                # Process calls
-                if not opt_chain.calls.empty:
-                    for _, row in opt_chain.calls.iterrows():
-                        all_options_data.append({
-                            "expiration": expiration,
-                            "strike": float(row['strike']),
-                            "type": "call",
-                            "volume": int(row['volume']) if pd.notna(row['volume']) else 0,
-                            "open_interest": int(row['openInterest']) if pd.notna(row['openInterest']) else 0,
-                            "bid": float(row['bid']) if pd.notna(row['bid']) else 0,
-                            "ask": float(row['ask']) if pd.notna(row['ask']) else 0,
-                            "last_price": float(row['lastPrice']) if pd.notna(row['lastPrice']) else 0,
-                            "implied_volatility": float(row['impliedVolatility']) if pd.notna(row['impliedVolatility']) else 0
-                        })
-
-                # Process puts
-                if not opt_chain.puts.empty:
-                    for _, row in opt_chain.puts.iterrows():
-                        all_options_data.append({
-                            "expiration": expiration,
-                            "strike": float(row['strike']),
-                            "type": "put",
-                            "volume": int(row['volume']) if pd.notna(row['volume']) else 0,
-                            "open_interest": int(row['openInterest']) if pd.notna(row['openInterest']) else 0,
-                            "bid": float(row['bid']) if pd.notna(row['bid']) else 0,
-                            "ask": float(row['ask']) if pd.notna(row['ask']) else 0,
-                            "last_price": float(row['lastPrice']) if pd.notna(row['lastPrice']) else 0,
-                            "implied_volatility": float(row['impliedVolatility']) if pd.notna(row['impliedVolatility']) else 0
-                        })
+        # Retry only the expirations that failed
+        for attempt in range(retries):
+            if not failed:
+                break
+            print(f"Retrying {len(failed)} failed expirations (attempt {attempt + 1}/{retries})...")
+            retried, failed = fetch_option_chains(ticker, failed, min(max_workers, len(failed)))
+            chains.update(retried)
 
-            except Exception as e:
-                print(f"Error fetching options for {expiration}: {e}")
-                continue
+        if failed:
+            print(f"Giving up on expirations: {', '.join(sorted(failed))}")
+
+        # Keep the output order deterministic regardless of completion order
+        all_options_data = []
+        for expiration in expirations:
+            all_options_data.extend(chains.get(expiration, []))
 
         print(f"Retrieved {len(all_options_data)} options contracts")
         return all_options_data
@@ -188,6 +268,24 @@ def fetch_real_options_data(etf_symbol, instrument_name):
         return []
 
 
+def index_options_by_strike(options_data):
+    """
+    Pair calls and puts by (expiration, strike) in a single pass
+    Returns a dict {(expiration, strike): {"call": option, "put": option}}
+    keeping the first contract seen for each side, in first-seen key order
+    """
+    pairs = {}
+    for option in options_data:
+        key = (option['expiration'], option['strike'])
+        pair = pairs.get(key)
+        if pair is None:
+            pair = pairs[key] = {"call": None, "put": None}
+        side = option['type']
+        if side in pair and pair[side] is None:
+            pair[side] = option
+    return pairs
+
+
 def generate_heatmap_from_options(options_data, current_price):
     """
     Generate heat map data from real options data
@@ -199,23 +297,12 @@ def generate_heatmap_from_options(options_data, current_price):
         print("No options data available")
         return []
 
-    # Group by strike and expiration
     heatmap_data = []
 
-    for option in options_data:
-        strike = option['strike']
-        expiration = option['expiration']
-
-        # Find matching call and put for same strike/expiration
-        call_data = next((o for o in options_data
-                         if o['strike'] == strike
-                         and o['expiration'] == expiration
-                         and o['type'] == 'call'), None)
-
-        put_data = next((o for o in options_data
-                        if o['strike'] == strike
-                        and o['expiration'] == expiration
-                        and o['type'] == 'put'), None)
+    # One row per (expiration, strike) pair, so no duplicates to remove afterwards
+    for (expiration, strike), pair in index_options_by_strike(options_data).items():
+        call_data = pair["call"]
+        put_data = pair["put"]
 
         call_volume = call_data['volume'] if call_data else 0
         put_volume = put_data['volume'] if put_data else 0
@@ -238,19 +325,10 @@ def generate_heatmap_from_options(options_data, current_price):
                 "distance_from_price": round(((strike - current_price) / current_price) * 100, 2)
             })
 
-    # Remove duplicates and sort by date and strike
-    seen = set()
-    unique_data = []
-    for item in heatmap_data:
-        key = (item['date'], item['strike'])
-        if key not in seen:
-            seen.add(key)
-            unique_data.append(item)
-
-    unique_data.sort(key=lambda x: (x['date'], x['strike']))
+    heatmap_data.sort(key=lambda x: (x['date'], x['strike']))
 
-    print(f"Generated {len(unique_data)} heat map data points")
-    return unique_data
+    print(f"Generated {len(heatmap_data)} heat map data points")
+    return heatmap_data
 
 
 def calculate_price_levels(heatmap_data):
@@ -294,18 +372,80 @@ def calculate_price_levels(heatmap_data):
     return price_levels
 
 
+def history_log_path(history_file):
+    """Append-only JSON-lines log backing a *_heatmap_history.json view"""
+    return os.path.splitext(history_file)[0] + ".jsonl"
+
+
+def read_history_log(log_file):
+    """Read snapshots from the JSON-lines log, skipping a torn last line"""
+    snapshots = []
+    with open(log_file, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                snapshots.append(json.loads(line))
+            except ValueError:
+                print(f"Skipping unreadable history entry in {log_file}")
+    return snapshots
+
+
+def write_history_log(log_file, snapshots):
+    """Atomically replace the log with the given snapshots"""
+    lines = "".join(json.dumps(snapshot, ensure_ascii=False) + "\n" for snapshot in snapshots)
+    compact_json.write_atomic(log_file, lines.encode("utf-8"))
+
+
 def load_history(history_file):
-    """Load existing historical snapshots"""
-    if os.path.exists(history_file):
-        try:
+    """
+    Load existing historical snapshots
+    Reads the append-only log, seeding it from the legacy JSON view on first use
+    """
+    log_file = history_log_path(history_file)
+    try:
+        if os.path.exists(log_file):
+            return {"snapshots": read_history_log(log_file)}
+        if os.path.exists(history_file):
             with open(history_file, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except Exception as e:
-            print(f"Error loading history file: {e}")
-            return {"snapshots": []}
+                snapshots = compact_json.decode(json.load(f)).get("snapshots", [])
+            write_history_log(log_file, snapshots)
+            return {"snapshots": snapshots}
+    except Exception as e:
+        print(f"Error loading history file: {e}")
     return {"snapshots": []}
 
 
+def append_snapshot(history_file, snapshot):
+    """Append one snapshot to the history log without rewriting it"""
+    log_file = history_log_path(history_file)
+    if not os.path.exists(log_file):
+        load_history(history_file)  # migrate the legacy JSON view, if any
+    with open(log_file, "a", encoding="utf-8") as f:
+        f.write(json.dumps(snapshot, ensure_ascii=False) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def compact_history(history_file, keep=HISTORY_MAX_SNAPSHOTS):
+    """
+    Trim the log to the last `keep` snapshots once it has grown to twice that size
+    Returns the last `keep` snapshots
+    """
+    log_file = history_log_path(history_file)
+    snapshots = read_history_log(log_file) if os.path.exists(log_file) else []
+    if len(snapshots) >= 2 * keep:
+        write_history_log(log_file, snapshots[-keep:])
+        print(f"History log compacted to {keep} snapshots")
+    return snapshots[-keep:]
+
+
+def export_history_view(history_file, snapshots):
+    """Atomically write the {"snapshots": [...]} view read by the frontend"""
+    compact_json.write_json({"snapshots": snapshots}, history_file)
+
+
 def save_snapshot_to_history(current_data, history_file):
     """
     Save current snapshot to historical record
@@ -313,8 +453,6 @@ def save_snapshot_to_history(current_data, history_file):
     """
     print("Saving snapshot to history...")
 
-    history = load_history(history_file)
-
     # Create snapshot with essential data
     snapshot = {
         "date": datetime.now().strftime("%Y-%m-%d"),
@@ -342,18 +480,11 @@ def save_snapshot_to_history(current_data, history_file):
         "cot_latest": current_data["cot_data"][-1] if current_data["cot_data"] else None
     }
 
-    # Add to history
-    history["snapshots"].append(snapshot)
-
-    # Keep only last 52 weeks
-    if len(history["snapshots"]) > 52:
-        history["snapshots"] = history["snapshots"][-52:]
-
-    # Save updated history
     try:
-        with open(history_file, "w", encoding="utf-8") as f:
-            json.dump(history, f, ensure_ascii=False, indent=2)
-        print(f"History saved: {len(history['snapshots'])} snapshots total")
+        append_snapshot(history_file, snapshot)
+        snapshots = compact_history(history_file)
+        export_history_view(history_file, snapshots)
+        print(f"History saved: {len(snapshots)} snapshots total")
     except Exception as e:
         print(f"Error saving history: {e}")
 
@@ -368,9 +499,12 @@ def fetch_instrument_data(config):
     - etf_symbol: Yahoo Finance ETF symbol (e.g., "GLD")
     - cftc_code: CFTC contract code (optional)
     - output_file: Path to output JSON file
-    - history_file: Path to history JSON file
+    - history_file: Path to history JSON file (backed by a sibling .jsonl log)
     - price_unit: Description of price unit
     - scale_factor: Multiplier to scale ETF strikes to futures price (optional, default 1)
+    - options_workers: Concurrent option chain requests (optional, default 6)
+    - options_timeout: Seconds before an option chain request times out (optional, default 30)
+    - options_retries: Retry passes for failed expirations (optional, default 2)
     """
     instrument_name = config['instrument_name']
 
@@ -385,7 +519,8 @@ def fetch_instrument_data(config):
         # Get ETF current price (for options context)
         print(f"Fetching {config['etf_symbol']} current price...")
         etf_ticker = yf.Ticker(config['etf_symbol'])
-        etf_hist = etf_ticker.history(period="1d")
+        etf_hist = fixtures.call("yfinance", ("history", config['etf_symbol'], "1d"),
+                                 lambda: etf_ticker.history(period="1d"))
         etf_current_price = etf_hist['Close'].iloc[-1] if not etf_hist.empty else None
 
         if etf_current_price is None:
@@ -396,7 +531,13 @@ def fetch_instrument_data(config):
         print(f"{config['etf_symbol']} ETF Price: ${etf_current_price:.2f}")
 
         # Fetch real options data
-        options_data = fetch_real_options_data(config['etf_symbol'], instrument_name)
+        options_data = fetch_real_options_data(
+            config['etf_symbol'],
+            instrument_name,
+            max_workers=config.get('options_workers', OPTIONS_MAX_WORKERS),
+            timeout=config.get('options_timeout', OPTIONS_REQUEST_TIMEOUT),
+            retries=config.get('options_retries', OPTIONS_RETRIES)
+        )
 
         if not options_data:
             print("Warning: No real options data available")
@@ -441,8 +582,7 @@ def fetch_instrument_data(config):
         }
 
         # Save current data to JSON
-        with open(config['output_file'], "w", encoding="utf-8") as f:
-            json.dump(result, f, ensure_ascii=False, indent=2)
+        compact_json.write_json(result, config['output_file'])
 
         print(f"\nData saved to: {config['output_file']}")
 
@@ -0,0 +1,42 @@
+"""
+Build all IMF DataMapper metrics in one process
+Run: python fetch_imf_all.py
+All indicators (NGDPD, GGXWDG_NGDP, LUR) are downloaded in one batched request
+and fanned out to the metric configs in imf_metrics.IMF_METRICS
+"""
+
+import os
+import sys
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import imf_loader
+from imf_metrics import IMF_METRICS, all_indicators, run_metric
+
+
+if __name__ == "__main__":
+    # Outside run_pipeline.py this script is a run of its own
+    os.environ.setdefault(imf_loader.RUN_ID_ENV, f"{datetime.now():%Y%m%dT%H%M%S}-{os.getpid()}")
+
+    print("=" * 80)
+    print("BUILDING ALL IMF METRICS")
+    print("=" * 80)
+
+    # One round trip for every indicator; the builders read from the memo
+    try:
+        imf_loader.load_indicators(all_indicators())
+    except Exception as e:
+        print(f"Batched IMF download failed: {e}")
+
+    failed = []
+    for metric in IMF_METRICS.values():
+        print(f"\n{'=' * 80}")
+        print(f"Building {metric['name']}...")
+        print(f"{'=' * 80}")
+        if not run_metric(metric):
+            failed.append(metric['name'])
+
+    if failed:
+        print(f"\nFailed: {', '.join(failed)}")
+    sys.exit(1 if failed else 0)
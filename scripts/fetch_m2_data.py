@@ -5,82 +5,35 @@ Indicator: FM.LBL.BMNY.GD.ZS (Broad money, % of GDP)
 """
 
 import requests
-import json
 import os
-import time
+import sys
 from datetime import datetime
-from country_mappings import COUNTRY_NAMES, REGIONS, ISO3_TO_ISO2, CURRENT_YEAR
-
-# World Bank API
-WB_M2_URL = "https://api.worldbank.org/v2/country/all/indicator/FM.LBL.BMNY.GD.ZS?format=json&per_page=20000&date=2000:{year}"
-WB_GDP_URL = "https://api.worldbank.org/v2/country/all/indicator/NY.GDP.MKTP.CD?format=json&per_page=20000&date=2000:{year}"
+import numpy as np
+import build_cache
+import compact_json
+import http_client
+import shards
+import world_bank
+from country_mappings import CURRENT_YEAR
+
+# World Bank indicators
+WB_M2_INDICATOR = "FM.LBL.BMNY.GD.ZS"
+WB_GDP_INDICATOR = "NY.GDP.MKTP.CD"
+WB_START_YEAR = 2000
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 OUTPUT_FILE = os.path.join(SCRIPT_DIR, "..", "data", "m2_data.json")
 
-# Reverse mapping ISO2 -> ISO3
-ISO2_TO_ISO3 = {v: k for k, v in ISO3_TO_ISO2.items()}
-
-MAX_RETRIES = 3
-RETRY_DELAY = 5
-
-
-def fetch_with_retry(url, description):
-    """Fetch URL with retries on failure"""
-    for attempt in range(MAX_RETRIES):
-        try:
-            response = requests.get(url, timeout=60)
-            response.raise_for_status()
-            return response.json()
-        except requests.RequestException as e:
-            print(f"  Attempt {attempt + 1}/{MAX_RETRIES} failed for {description}: {e}")
-            if attempt < MAX_RETRIES - 1:
-                print(f"  Retrying in {RETRY_DELAY} seconds...")
-                time.sleep(RETRY_DELAY)
-            else:
-                raise
-
 
 def fetch_m2_data():
     print("Downloading M2 data from World Bank...")
 
-    # Fetch M2 as % of GDP
-    print(f"Fetching M2 (% of GDP)...")
-    m2_json = fetch_with_retry(WB_M2_URL.format(year=CURRENT_YEAR), "M2")
-
-    # Fetch GDP in current USD
-    print(f"Fetching GDP (USD)...")
-    gdp_json = fetch_with_retry(WB_GDP_URL.format(year=CURRENT_YEAR), "GDP")
-
-    if len(m2_json) < 2 or len(gdp_json) < 2:
-        raise ValueError("No data found")
-
-    # Parse M2 % data
-    m2_pct_data = {}
-    for item in m2_json[1] or []:
-        country_code = item.get("country", {}).get("id")
-        year = item.get("date")
-        value = item.get("value")
-        if country_code and year and value is not None:
-            if country_code not in m2_pct_data:
-                m2_pct_data[country_code] = {}
-            m2_pct_data[country_code][year] = float(value)
-
-    # Parse GDP data
-    gdp_data = {}
-    for item in gdp_json[1] or []:
-        country_code = item.get("country", {}).get("id")
-        year = item.get("date")
-        value = item.get("value")
-        if country_code and year and value is not None:
-            if country_code not in gdp_data:
-                gdp_data[country_code] = {}
-            gdp_data[country_code][year] = float(value)
-
-    # Get all years
-    all_years = set()
-    for country_data in m2_pct_data.values():
-        all_years.update(country_data.keys())
-    years = sorted([y for y in all_years if y.isdigit()], reverse=True)[:25]
+    # M2 as % of GDP and GDP in current USD, every page folded into one matrix
+    print(f"Fetching M2 (% of GDP) and GDP (USD)...")
+    matrix = world_bank.fetch_indicators([WB_M2_INDICATOR, WB_GDP_INDICATOR], WB_START_YEAR, CURRENT_YEAR)
+    hashes = http_client.upstream_hashes(matrix.urls, __file__, shards.__file__)
+    http_client.skip_if_unchanged(matrix.urls, OUTPUT_FILE, hashes)
+
+    years = sorted([y for y in matrix.reported_years[WB_M2_INDICATOR] if y.isdigit()], reverse=True)[:25]
 
     print(f"Available years: {years[-1] if years else 'N/A'} - {years[0] if years else 'N/A'}")
 
@@ -98,75 +51,20 @@ def fetch_m2_data():
         "timeseries": {}
     }
 
+    # M2 in USD for every (country, year) at once; NaN wherever an input is missing
+    m2 = np.round(matrix.values[WB_M2_INDICATOR] / 100 * matrix.values[WB_GDP_INDICATOR], 0)
+
+    result["data"], result["timeseries"] = world_bank.build_views(matrix, years, {"value": m2}, region_default="Otro")
     for year in years:
-        year_data = []
-        for iso2_code in m2_pct_data:
-            iso3_code = ISO2_TO_ISO3.get(iso2_code)
-            if iso3_code not in COUNTRY_NAMES:
-                continue
-
-            m2_pct = m2_pct_data.get(iso2_code, {}).get(year)
-            gdp = gdp_data.get(iso2_code, {}).get(year)
-
-            if m2_pct is None or gdp is None:
-                continue
-
-            try:
-                m2_value = round((m2_pct / 100) * gdp, 0)
-                year_data.append({
-                    "code": iso3_code,
-                    "country": COUNTRY_NAMES[iso3_code],
-                    "value": m2_value,
-                    "region": REGIONS.get(iso3_code, "Otro"),
-                    "isProjection": False
-                })
-            except (ValueError, TypeError):
-                continue
-
-        result["data"][year] = sorted(year_data, key=lambda x: -x["value"])
-        print(f"  {year}: {len(year_data)} countries")
-
-    # Build timeseries
-    for iso2_code in m2_pct_data:
-        iso3_code = ISO2_TO_ISO3.get(iso2_code)
-        if iso3_code not in COUNTRY_NAMES:
-            continue
-
-        series = []
-        for year in sorted(years):
-            m2_pct = m2_pct_data.get(iso2_code, {}).get(year)
-            gdp = gdp_data.get(iso2_code, {}).get(year)
-
-            if m2_pct is not None and gdp is not None:
-                try:
-                    m2_value = round((m2_pct / 100) * gdp, 0)
-                    series.append({
-                        "year": year,
-                        "value": m2_value,
-                        "isProjection": False
-                    })
-                except (ValueError, TypeError):
-                    continue
-
-        if series:
-            result["timeseries"][iso3_code] = {
-                "country": COUNTRY_NAMES[iso3_code],
-                "region": REGIONS.get(iso3_code, "Otro"),
-                "data": series
-            }
+        print(f"  {year}: {len(result['data'][year])} countries")
 
     # Build World M2 timeseries (sum of all countries)
     world_series = []
     for year in sorted(years):
-        year_total = 0
-        country_count = 0
-        for year_entry in result["data"].get(year, []):
-            year_total += year_entry["value"]
-            country_count += 1
-        if country_count > 0:
+        if result["data"][year]:
             world_series.append({
                 "year": year,
-                "value": round(year_total, 0),
+                "value": round(sum(entry["value"] for entry in result["data"][year]), 0),
                 "isProjection": False
             })
 
@@ -178,15 +76,15 @@ def fetch_m2_data():
         }
         print(f"  World M2 calculated: {len(world_series)} years")
 
-    return result
+    return build_cache.record(result, hashes)
 
 
 def main():
     try:
         data = fetch_m2_data()
 
-        with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        compact_json.write_json(data, OUTPUT_FILE)
+        shards.write_shards(data, OUTPUT_FILE)
 
         print(f"\nData saved to: {OUTPUT_FILE}")
         print(f"Total years: {len(data['data'])}")
@@ -198,13 +96,18 @@ def main():
             for i, country in enumerate(data["data"][latest_year][:10], 1):
                 print(f"  {i}. {country['country']}: ${country['value']/1e12:.2f}T")
 
+    except http_client.UpstreamUnchanged as e:
+        print(e)
     except requests.RequestException as e:
         print(f"Connection error: {e}")
+        return 1
     except Exception as e:
         print(f"Error: {e}")
         import traceback
         traceback.print_exc()
+        return 1
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -5,10 +5,10 @@ PMI below 50 indicates contraction, above 50 indicates expansion.
 Data source: OECD API
 """
 
-import json
 import sys
 from pathlib import Path
 from datetime import datetime
+import compact_json
 import requests
 
 # Country mapping
@@ -133,8 +133,7 @@ def main():
 
     # Save to file
     output_file = Path(__file__).parent.parent / 'data' / 'pmi_data.json'
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(output, f, indent=2, ensure_ascii=False)
+    compact_json.write_json(output, output_file)
 
     print(f"\n[OK] PMI data saved to {output_file}")
 
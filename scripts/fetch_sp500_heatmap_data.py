@@ -24,4 +24,4 @@ config = {
 }
 
 if __name__ == "__main__":
-    fetch_instrument_data(config)
+    sys.exit(0 if fetch_instrument_data(config) else 1)
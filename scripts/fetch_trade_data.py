@@ -4,81 +4,34 @@ Indicators: NE.EXP.GNFS.CD (Exports) and NE.IMP.GNFS.CD (Imports)
 """
 
 import requests
-import json
 import os
-import time
+import sys
 from datetime import datetime
-from country_mappings import COUNTRY_NAMES, REGIONS, ISO3_TO_ISO2, CURRENT_YEAR
-
-WB_EXPORTS_URL = "https://api.worldbank.org/v2/country/all/indicator/NE.EXP.GNFS.CD?format=json&per_page=20000&date=2000:{year}"
-WB_IMPORTS_URL = "https://api.worldbank.org/v2/country/all/indicator/NE.IMP.GNFS.CD?format=json&per_page=20000&date=2000:{year}"
+import numpy as np
+import build_cache
+import compact_json
+import http_client
+import shards
+import world_bank
+from country_mappings import CURRENT_YEAR
+
+WB_EXPORTS_INDICATOR = "NE.EXP.GNFS.CD"
+WB_IMPORTS_INDICATOR = "NE.IMP.GNFS.CD"
+WB_START_YEAR = 2000
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 OUTPUT_FILE = os.path.join(SCRIPT_DIR, "..", "data", "trade_data.json")
 
-# Reverse mapping ISO2 -> ISO3
-ISO2_TO_ISO3 = {v: k for k, v in ISO3_TO_ISO2.items()}
-
-MAX_RETRIES = 3
-RETRY_DELAY = 5
-
-
-def fetch_with_retry(url, description):
-    """Fetch URL with retries on failure"""
-    for attempt in range(MAX_RETRIES):
-        try:
-            response = requests.get(url, timeout=60)
-            response.raise_for_status()
-            return response.json()
-        except requests.RequestException as e:
-            print(f"  Attempt {attempt + 1}/{MAX_RETRIES} failed for {description}: {e}")
-            if attempt < MAX_RETRIES - 1:
-                print(f"  Retrying in {RETRY_DELAY} seconds...")
-                time.sleep(RETRY_DELAY)
-            else:
-                raise
-
 
 def fetch_trade_data():
     print("Downloading Trade Balance data from World Bank...")
 
-    # Fetch exports
-    print(f"Fetching Exports...")
-    exports_json = fetch_with_retry(WB_EXPORTS_URL.format(year=CURRENT_YEAR), "Exports")
-
-    # Fetch imports
-    print(f"Fetching Imports...")
-    imports_json = fetch_with_retry(WB_IMPORTS_URL.format(year=CURRENT_YEAR), "Imports")
-
-    if len(exports_json) < 2 or len(imports_json) < 2:
-        raise ValueError("No data found")
-
-    # Parse exports data
-    exports_data = {}
-    for item in exports_json[1] or []:
-        country_code = item.get("country", {}).get("id")
-        year = item.get("date")
-        value = item.get("value")
-        if country_code and year and value is not None:
-            if country_code not in exports_data:
-                exports_data[country_code] = {}
-            exports_data[country_code][year] = float(value)
-
-    # Parse imports data
-    imports_data = {}
-    for item in imports_json[1] or []:
-        country_code = item.get("country", {}).get("id")
-        year = item.get("date")
-        value = item.get("value")
-        if country_code and year and value is not None:
-            if country_code not in imports_data:
-                imports_data[country_code] = {}
-            imports_data[country_code][year] = float(value)
-
-    # Get all years
-    all_years = set()
-    for country_data in exports_data.values():
-        all_years.update(country_data.keys())
-    years = sorted([y for y in all_years if y.isdigit()], reverse=True)[:25]
+    # Exports and imports, every page folded into one matrix
+    print(f"Fetching Exports and Imports...")
+    matrix = world_bank.fetch_indicators([WB_EXPORTS_INDICATOR, WB_IMPORTS_INDICATOR], WB_START_YEAR, CURRENT_YEAR)
+    hashes = http_client.upstream_hashes(matrix.urls, __file__, shards.__file__)
+    http_client.skip_if_unchanged(matrix.urls, OUTPUT_FILE, hashes)
+
+    years = sorted([y for y in matrix.reported_years[WB_EXPORTS_INDICATOR] if y.isdigit()], reverse=True)[:25]
 
     print(f"Available years: {years[-1] if years else 'N/A'} - {years[0] if years else 'N/A'}")
 
@@ -96,76 +49,28 @@ def fetch_trade_data():
         "timeseries": {}
     }
 
+    # Balance for every (country, year) at once; NaN wherever an input is missing
+    exports = matrix.values[WB_EXPORTS_INDICATOR]
+    imports = matrix.values[WB_IMPORTS_INDICATOR]
+    columns = {
+        "value": np.round(exports - imports, 0),
+        "exports": np.round(exports, 0),
+        "imports": np.round(imports, 0)
+    }
+
+    result["data"], result["timeseries"] = world_bank.build_views(matrix, years, columns)
     for year in years:
-        year_data = []
-        for iso2_code in exports_data:
-            iso3_code = ISO2_TO_ISO3.get(iso2_code)
-            if iso3_code not in COUNTRY_NAMES:
-                continue
-
-            exports = exports_data.get(iso2_code, {}).get(year)
-            imports = imports_data.get(iso2_code, {}).get(year)
-
-            if exports is None or imports is None:
-                continue
-
-            try:
-                balance = round(exports - imports, 0)
-                year_data.append({
-                    "code": iso3_code,
-                    "country": COUNTRY_NAMES[iso3_code],
-                    "value": balance,
-                    "exports": round(exports, 0),
-                    "imports": round(imports, 0),
-                    "region": REGIONS.get(iso3_code, "Other"),
-                    "isProjection": False
-                })
-            except (ValueError, TypeError):
-                continue
-
-        result["data"][year] = sorted(year_data, key=lambda x: -x["value"])
-        print(f"  {year}: {len(year_data)} countries")
-
-    # Build timeseries
-    for iso2_code in exports_data:
-        iso3_code = ISO2_TO_ISO3.get(iso2_code)
-        if iso3_code not in COUNTRY_NAMES:
-            continue
-
-        series = []
-        for year in sorted(years):
-            exports = exports_data.get(iso2_code, {}).get(year)
-            imports = imports_data.get(iso2_code, {}).get(year)
-
-            if exports is not None and imports is not None:
-                try:
-                    balance = round(exports - imports, 0)
-                    series.append({
-                        "year": year,
-                        "value": balance,
-                        "exports": round(exports, 0),
-                        "imports": round(imports, 0),
-                        "isProjection": False
-                    })
-                except (ValueError, TypeError):
-                    continue
-
-        if series:
-            result["timeseries"][iso3_code] = {
-                "country": COUNTRY_NAMES[iso3_code],
-                "region": REGIONS.get(iso3_code, "Other"),
-                "data": series
-            }
-
-    return result
+        print(f"  {year}: {len(result['data'][year])} countries")
+
+    return build_cache.record(result, hashes)
 
 
 def main():
     try:
         data = fetch_trade_data()
 
-        with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        compact_json.write_json(data, OUTPUT_FILE)
+        shards.write_shards(data, OUTPUT_FILE)
 
         print(f"\nData saved to: {OUTPUT_FILE}")
         print(f"Total years: {len(data['data'])}")
@@ -182,13 +87,18 @@ def main():
             for i, country in enumerate(deficit, 1):
                 print(f"  {i}. {country['country']}: ${country['value']/1e9:.1f}B")
 
+    except http_client.UpstreamUnchanged as e:
+        print(e)
     except requests.RequestException as e:
         print(f"Connection error: {e}")
+        return 1
     except Exception as e:
         print(f"Error: {e}")
         import traceback
         traceback.print_exc()
+        return 1
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
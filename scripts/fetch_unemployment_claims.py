@@ -5,10 +5,10 @@ Rising claims signal labor market weakness and potential recession.
 Data source: OECD / National statistical agencies (using mock data)
 """
 
-import json
 import sys
 from pathlib import Path
 from datetime import datetime
+import compact_json
 
 # Country mapping with typical weekly claims
 COUNTRIES = {
@@ -144,8 +144,7 @@ def main():
 
     # Save to file
     output_file = Path(__file__).parent.parent / 'data' / 'unemployment_claims_data.json'
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(output, f, indent=2, ensure_ascii=False)
+    compact_json.write_json(output, output_file)
 
     print(f"\n[OK] Unemployment claims data saved to {output_file}")
 
@@ -4,21 +4,23 @@ Calculate Yield Curve Spread (10Y-2Y) from existing bond data.
 A negative spread (inverted yield curve) historically precedes recessions.
 """
 
-import json
 import sys
 from pathlib import Path
 from datetime import datetime
+import build_cache
+import compact_json
+
+DATA_DIR = Path(__file__).parent.parent / 'data'
+BONDS_FILE = DATA_DIR / 'bonds_data.json'
+OUTPUT_FILE = DATA_DIR / 'yield_curve_data.json'
 
 def load_bonds_data():
     """Load existing bonds data."""
-    bonds_file = Path(__file__).parent.parent / 'data' / 'bonds_data.json'
-
-    if not bonds_file.exists():
-        print(f"Error: {bonds_file} not found. Run fetch_bonds_data.py first.", file=sys.stderr)
+    if not BONDS_FILE.exists():
+        print(f"Error: {BONDS_FILE} not found. Run fetch_bonds_data.py first.", file=sys.stderr)
         sys.exit(1)
 
-    with open(bonds_file, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return compact_json.read_json(BONDS_FILE)
 
 def calculate_yield_curve_spreads(bonds_data):
     """Calculate 10Y-2Y spread for each country."""
@@ -96,6 +98,11 @@ def build_output_structure(spreads, bonds_metadata):
     return output
 
 def main():
+    inputs = build_cache.input_hashes([BONDS_FILE], __file__)
+    if build_cache.is_up_to_date(OUTPUT_FILE, inputs):
+        print(f"[OK] Inputs unchanged, keeping {OUTPUT_FILE}")
+        return 0
+
     print("Loading bonds data...")
     bonds_data = load_bonds_data()
 
@@ -107,13 +114,12 @@ def main():
     print(f"Inverted yield curves: {inverted}/{len(spreads)} countries")
 
     output = build_output_structure(spreads, bonds_data.get('metadata', {}))
+    build_cache.record(output, inputs)
 
     # Save to file
-    output_file = Path(__file__).parent.parent / 'data' / 'yield_curve_data.json'
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(output, f, indent=2, ensure_ascii=False)
+    compact_json.write_json(output, OUTPUT_FILE)
 
-    print(f"\n[OK] Yield curve data saved to {output_file}")
+    print(f"\n[OK] Yield curve data saved to {OUTPUT_FILE}")
 
     # Print summary
     print("\n" + "="*60)
@@ -0,0 +1,111 @@
+"""
+Offline record/replay fixtures for every upstream source
+Run a fetcher (or run_pipeline.py --record) with FIXTURES=record to fetch live
+and save every raw response; FIXTURES=replay serves the saved responses without
+touching the network, so the whole pipeline runs offline in seconds
+(python run_pipeline.py --replay --force) for benchmarking and debugging
+
+IMF, World Bank, FRED, CFTC and the Big Mac CSV go through http_client, which
+records each response by method and resolved URL. Yahoo Finance and
+Investing.com are reached through yfinance and investpy, so their calls are
+recorded by call() as pickled results (DataFrames). The HTTP cache is off in
+both modes: recorded bodies are full 200 responses and a replay never depends
+on .cache/http or the FRED store
+
+Fixtures live in .cache/fixtures (set FIXTURES_DIR to use another directory).
+A replayed request or call without a fixture raises FixtureMissing
+"""
+
+import json
+import os
+import pickle
+import threading
+from urllib.parse import urlsplit
+
+import requests
+
+import compact_json
+from http_cache import cache_key
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURES_DIR = os.environ.get("FIXTURES_DIR") or os.path.join(SCRIPT_DIR, "..", ".cache", "fixtures")
+MODES = ("record", "replay")
+
+MODE = os.environ.get("FIXTURES", "").strip().lower() or None
+if MODE is not None and MODE not in MODES:
+    raise ValueError(f"FIXTURES must be one of {', '.join(MODES)}, got {MODE!r}")
+
+_lock = threading.Lock()
+
+
+class FixtureMissing(requests.ConnectionError):
+    """Raised in replay mode for a request or call that was never recorded"""
+
+
+def _write(path, payload):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with _lock:
+        compact_json.write_atomic(path, payload)
+
+
+def _http_paths(method, url):
+    key = cache_key(f"{method} {url}")
+    directory = os.path.join(FIXTURES_DIR, "http", urlsplit(url).netloc.replace(":", "_"))
+    return os.path.join(directory, f"{key}.json"), os.path.join(directory, f"{key}.body")
+
+
+def save_response(method, url, response):
+    """Record a response under its method and resolved URL"""
+    meta_path, body_path = _http_paths(method, url)
+    meta = {
+        "method": method,
+        "url": url,
+        "status": response.status_code,
+        "content_type": response.headers.get("Content-Type"),
+        "encoding": response.encoding
+    }
+    _write(body_path, response.content)
+    _write(meta_path, json.dumps(meta, indent=2).encode("utf-8"))
+
+
+def load_response(method, url):
+    """requests.Response rebuilt from the fixture of method + resolved URL"""
+    meta_path, body_path = _http_paths(method, url)
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        with open(body_path, "rb") as f:
+            body = f.read()
+    except (OSError, ValueError):
+        raise FixtureMissing(f"No fixture for {method} {url}") from None
+
+    response = requests.Response()
+    response.status_code = meta["status"]
+    response._content = body
+    response.url = url
+    response.encoding = meta.get("encoding")
+    if meta.get("content_type"):
+        response.headers["Content-Type"] = meta["content_type"]
+    return response
+
+
+def call(source, key, func):
+    """
+    Result of func() for a library call recorded as (source, key), e.g.
+    call("yfinance", ("history", "GC=F", "6mo"), lambda: ticker.history(period="6mo"))
+    Record mode saves the result; replay mode returns the saved one without calling func
+    """
+    if MODE is None:
+        return func()
+
+    path = os.path.join(FIXTURES_DIR, "calls", source, f"{cache_key(repr(key))}.pkl")
+    if MODE == "replay":
+        try:
+            with open(path, "rb") as f:
+                return pickle.load(f)["result"]
+        except (OSError, pickle.UnpicklingError, EOFError, KeyError):
+            raise FixtureMissing(f"No fixture for {source} {key!r}") from None
+
+    result = func()
+    _write(path, pickle.dumps({"source": source, "key": key, "result": result}))
+    return result
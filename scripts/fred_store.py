@@ -0,0 +1,211 @@
+"""
+Local FRED time-series store
+Parsed observations of each series are kept in .cache/fred/<series_id>.json.
+A refresh asks FRED only for observations from the last stored date on
+(fredgraph.csv?id=...&cosd=YYYY-MM-DD) and merges them in, so a weekly run of
+a daily series downloads a few rows instead of decades of history. The last
+stored date is requested again so a revised latest value replaces the old one.
+Each series is refreshed at most once per process; prefetch() refreshes many
+concurrently (http_client caps requests in flight to FRED)
+
+Pass --no-cache to a fetcher (or set HTTP_CACHE=0) to rebuild the store from
+full downloads
+"""
+
+import bisect
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date as Date
+
+import numpy as np
+
+import compact_json
+import http_client
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+STORE_DIR = os.path.join(SCRIPT_DIR, "..", ".cache", "fred")
+FRED_CSV_URL = "https://fred.stlouisfed.org/graph/fredgraph.csv?id={series_id}"
+FRED_WORKERS = 4
+
+# (median days between observations, maximum age in days of an as-of value):
+# daily, weekly, monthly, quarterly and annual series
+STALENESS_DAYS = [(3, 5), (8, 10), (31, 45), (92, 100), (366, 400)]
+
+_lock = threading.Lock()
+_series_locks = {}
+_series = {}  # series_id -> (dates, values) refreshed in this process
+_errors = {}  # series_id -> exception raised by its refresh
+_urls = {}  # series_id -> URL of the last download
+_max_ages = {}  # series_id -> max_age_days of its observations
+
+
+def series_url(series_id, start=None):
+    url = FRED_CSV_URL.format(series_id=series_id)
+    return f"{url}&cosd={start}" if start else url
+
+
+def store_path(series_id):
+    return os.path.join(STORE_DIR, f"{series_id}.json")
+
+
+def parse_csv(text):
+    """(dates, values) of a FRED CSV, skipping the header and missing values ('.')"""
+    dates, values = [], []
+    for line in text.strip().split("\n")[1:]:
+        parts = line.strip().split(",")
+        if len(parts) != 2 or parts[1] in ("", "."):
+            continue
+        try:
+            value = float(parts[1])
+        except ValueError:
+            continue
+        dates.append(parts[0])
+        values.append(value)
+    return dates, values
+
+
+def load(series_id):
+    """Stored (dates, values) of a series, ascending by date; empty when not stored"""
+    try:
+        with open(store_path(series_id), "r", encoding="utf-8") as f:
+            stored = json.load(f)
+        return stored["dates"], stored["values"]
+    except (OSError, ValueError, KeyError):
+        return [], []
+
+
+def save(series_id, dates, values):
+    os.makedirs(STORE_DIR, exist_ok=True)
+    payload = json.dumps({"series_id": series_id, "dates": dates, "values": values},
+                         separators=(",", ":")).encode("utf-8")
+    compact_json.write_atomic(store_path(series_id), payload)
+
+
+def merge(dates, values, new_dates, new_values):
+    """Observations merged by date, new values winning on overlapping dates"""
+    merged = dict(zip(dates, values))
+    merged.update(zip(new_dates, new_values))
+    ordered = sorted(merged)
+    return ordered, [merged[date] for date in ordered]
+
+
+def refresh(series_id):
+    """Download observations newer than the stored ones, merge and save them"""
+    dates, values = load(series_id) if http_client.CACHE_ENABLED else ([], [])
+    start = dates[-1] if dates else None
+    url = series_url(series_id, start)
+
+    new_dates, new_values = parse_csv(http_client.get_text(url, description=series_id))
+    added = sum(1 for date in new_dates if not start or date > start)
+    if start:
+        print(f"    {series_id}: {added} new observations since {start}")
+
+    merged = merge(dates, values, new_dates, new_values)
+    if merged != (dates, values):
+        save(series_id, *merged)
+    _urls[series_id] = url
+    return merged
+
+
+def get_observations(series_id):
+    """(dates, values) of a series, refreshed once per process"""
+    with _lock:
+        series_lock = _series_locks.setdefault(series_id, threading.Lock())
+    with series_lock:
+        if series_id in _errors:
+            raise _errors[series_id]
+        if series_id not in _series:
+            try:
+                _series[series_id] = refresh(series_id)
+            except Exception as e:
+                _errors[series_id] = e
+                raise
+        return _series[series_id]
+
+
+def prefetch(series_ids, max_workers=FRED_WORKERS):
+    """
+    Refresh several series concurrently, so the reads that follow (in the
+    caller's own order) are served from memory. A series that failed raises
+    its error when it is read
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(get_observations, series_id) for series_id in dict.fromkeys(series_ids)]
+        for future in futures:
+            future.exception()
+
+
+def get_series(series_id):
+    """Observations as [{"date": ..., "value": ...}], ascending by date"""
+    dates, values = get_observations(series_id)
+    return [{"date": date, "value": value} for date, value in zip(dates, values)]
+
+
+def max_age_days(observed):
+    """
+    Oldest observation (days before the as-of date) still usable for a series,
+    from its frequency: the median gap between observations (datetime64[D] array)
+    """
+    if len(observed) < 2:
+        return STALENESS_DAYS[-1][1]
+    gap = float(np.median(np.diff(observed).astype(int)))
+    for max_gap, days in STALENESS_DAYS:
+        if gap <= max_gap:
+            return days
+    return STALENESS_DAYS[-1][1]
+
+
+def series_max_age(series_id):
+    """max_age_days of a series, computed once per process"""
+    if series_id not in _max_ages:
+        dates, _ = get_observations(series_id)
+        _max_ages[series_id] = max_age_days(np.array(dates, dtype="datetime64[D]"))
+    return _max_ages[series_id]
+
+
+def as_of(series_id, date):
+    """
+    (date, value) of the latest observation on or before `date` (YYYY-MM-DD),
+    found by binary search. None when there is none or it is older than the
+    series frequency allows (max_age_days), so no future or stale value is used
+    """
+    dates, values = get_observations(series_id)
+    i = bisect.bisect_right(dates, date) - 1
+    if i < 0:
+        return None
+    if (Date.fromisoformat(date) - Date.fromisoformat(dates[i])).days > series_max_age(series_id):
+        return None
+    return dates[i], values[i]
+
+
+def as_of_many(series_id, dates):
+    """
+    as_of() for many dates at once (vectorized binary search)
+    dates: datetime64[D] array; returns (observation dates, values) arrays,
+    NaT/NaN where no recent enough observation precedes the date
+    """
+    observed, values = get_observations(series_id)
+    dates = np.asarray(dates, dtype="datetime64[D]")
+    found_dates = np.full(len(dates), np.datetime64("NaT"), dtype="datetime64[D]")
+    found_values = np.full(len(dates), np.nan)
+    if not observed:
+        return found_dates, found_values
+
+    observed = np.array(observed, dtype="datetime64[D]")
+    values = np.asarray(values, dtype=float)
+    index = np.searchsorted(observed, dates, side="right") - 1
+    valid = index >= 0
+    valid[valid] = (dates[valid] - observed[index[valid]]).astype(int) <= series_max_age(series_id)
+    found_dates[valid] = observed[index[valid]]
+    found_values[valid] = values[index[valid]]
+    return found_dates, found_values
+
+
+def fetched_urls(series_ids):
+    """
+    URLs downloaded for these series, for http_client.skip_if_unchanged
+    A series that failed to refresh keeps its full URL, which counts as changed
+    """
+    return [_urls.get(series_id, series_url(series_id)) for series_id in series_ids]
@@ -0,0 +1,123 @@
+"""
+On-disk HTTP response cache used by http_client
+Stores response bodies with their ETag / Last-Modified validators so unchanged
+upstream payloads can be revalidated with a conditional GET (304 Not Modified)
+Least recently used entries are evicted once the cache exceeds its size budget
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+
+import compact_json
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(SCRIPT_DIR, "..", ".cache", "http")
+MAX_CACHE_BYTES = 256 * 1024 * 1024
+
+
+def cache_key(url):
+    """Stable file name for a fully resolved URL (query string included)"""
+    return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Body + validator store keyed by URL, bounded to max_bytes with LRU eviction"""
+
+    def __init__(self, cache_dir=CACHE_DIR, max_bytes=MAX_CACHE_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _paths(self, url):
+        key = cache_key(url)
+        return os.path.join(self.cache_dir, f"{key}.json"), os.path.join(self.cache_dir, f"{key}.body")
+
+    def _read_meta(self, meta_path):
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_meta(self, meta_path, meta):
+        compact_json.write_atomic(meta_path, json.dumps(meta).encode("utf-8"))
+
+    def validators(self, url):
+        """Conditional request headers for a cached URL ({} when not cached)"""
+        meta_path, body_path = self._paths(url)
+        meta = self._read_meta(meta_path)
+        if not meta or not os.path.exists(body_path):
+            return {}
+        headers = {}
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+        return headers
+
+    def load(self, url):
+        """Return (meta, body) for a cached URL and mark it as recently used"""
+        meta_path, body_path = self._paths(url)
+        with self._lock:
+            meta = self._read_meta(meta_path)
+            if not meta:
+                return None
+            try:
+                with open(body_path, "rb") as f:
+                    body = f.read()
+            except OSError:
+                return None
+            meta["last_used"] = time.time()
+            self._write_meta(meta_path, meta)
+        return meta, body
+
+    def store(self, url, response):
+        """Cache a 200 response if it carries an ETag or Last-Modified validator"""
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if not etag and not last_modified:
+            return
+
+        meta_path, body_path = self._paths(url)
+        meta = {
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "content_type": response.headers.get("Content-Type"),
+            "encoding": response.encoding,
+            "size": len(response.content),
+            "stored_at": time.time(),
+            "last_used": time.time()
+        }
+        with self._lock:
+            compact_json.write_atomic(body_path, response.content)
+            self._write_meta(meta_path, meta)
+            self._evict()
+
+    def _evict(self):
+        """Drop least recently used entries until the cache fits in max_bytes"""
+        entries = []
+        total = 0
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".json"):
+                continue
+            meta_path = os.path.join(self.cache_dir, name)
+            meta = self._read_meta(meta_path)
+            if not meta:
+                continue
+            entries.append((meta.get("last_used", 0), meta.get("size", 0), meta_path))
+            total += meta.get("size", 0)
+
+        for _, size, meta_path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            for path in (meta_path, meta_path[:-len(".json")] + ".body"):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            total -= size
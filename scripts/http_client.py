@@ -0,0 +1,297 @@
+"""
+Shared HTTP client for all data fetchers
+Keep-alive connection pooling per host, retries with exponential backoff and jitter,
+per-host rate limits and concurrency caps, per-request byte/latency tracking and an on-disk
+conditional-GET cache (ETag / Last-Modified)
+
+Pass --no-cache to any fetcher (or set HTTP_CACHE=0) to bypass the cache
+Set FIXTURES=record or FIXTURES=replay to record responses or serve them offline (fixtures.py)
+"""
+
+import atexit
+import hashlib
+import os
+import random
+import sys
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import build_cache
+import fixtures
+from http_cache import ResponseCache
+
+DEFAULT_TIMEOUT = 30
+MAX_RETRIES = 3
+BACKOFF_BASE = 2  # seconds, doubled on every attempt
+BACKOFF_MAX = 30
+POOL_SIZE = 10
+
+# Responses worth retrying (rate limited or transient server errors)
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+# Minimum seconds between two requests to the same host
+HOST_RATE_LIMITS = {
+    "www.imf.org": 0.5,
+    "api.worldbank.org": 0.2,
+    "fred.stlouisfed.org": 0.2,
+    "publicreporting.cftc.gov": 0.5,
+    "raw.githubusercontent.com": 0.0
+}
+DEFAULT_RATE_LIMIT = 0.1
+
+# Maximum requests in flight to the same host (threaded fetchers)
+HOST_CONCURRENCY = {
+    "fred.stlouisfed.org": 4
+}
+DEFAULT_CONCURRENCY = POOL_SIZE
+
+USER_AGENT = "borosa-graphs data pipeline (+https://github.com/miguelangelgil/borosa-graphs)"
+
+CACHE_ENABLED = ("--no-cache" not in sys.argv and os.environ.get("HTTP_CACHE", "1") != "0"
+                 and fixtures.MODE is None)
+
+
+class UpstreamUnchanged(Exception):
+    """Raised by a fetcher when every upstream payload revalidated as 304 Not Modified"""
+
+
+def resolve_url(url, params=None):
+    """Full request URL, query string included (the cache and change-tracking key)"""
+    return requests.Request("GET", url, params=params).prepare().url
+
+
+class HttpClient:
+    """Pooled, rate limited HTTP client shared by every fetcher in a process"""
+
+    def __init__(self, rate_limits=None, max_retries=MAX_RETRIES, cache=None, concurrency=None):
+        self.rate_limits = dict(HOST_RATE_LIMITS if rate_limits is None else rate_limits)
+        self.concurrency = dict(HOST_CONCURRENCY if concurrency is None else concurrency)
+        self.max_retries = max_retries
+        self.cache = cache
+        self.stats = []
+        self.modified = {}  # resolved URL -> False when last served from a 304
+        self.body_hashes = {}  # resolved URL -> SHA-256 of the body last served for it
+
+        self._lock = threading.Lock()
+        self._next_slot = {}
+        self._host_slots = {}
+        self._session = requests.Session()
+        self._session.headers["User-Agent"] = USER_AGENT
+        adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+
+    def _wait_for_slot(self, host):
+        """Block until the host's rate limit allows another request"""
+        interval = self.rate_limits.get(host, DEFAULT_RATE_LIMIT)
+        if interval <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + interval
+        if slot > now:
+            time.sleep(slot - now)
+
+    def _host_semaphore(self, host):
+        """Semaphore bounding the requests in flight to one host"""
+        with self._lock:
+            if host not in self._host_slots:
+                limit = self.concurrency.get(host, DEFAULT_CONCURRENCY)
+                self._host_slots[host] = threading.BoundedSemaphore(limit)
+            return self._host_slots[host]
+
+    def _record(self, url, host, status, size, seconds, attempts):
+        with self._lock:
+            self.stats.append({
+                "url": url,
+                "host": host,
+                "status": status,
+                "bytes": size,
+                "seconds": round(seconds, 3),
+                "attempts": attempts
+            })
+
+    def request(self, method, url, params=None, headers=None, timeout=DEFAULT_TIMEOUT,
+                retries=None, description=None, cache=True):
+        """
+        Send a request, retrying connection errors and RETRY_STATUS responses
+        Cached GETs are revalidated; a 304 returns the cached body with from_cache=True
+        Raises requests.RequestException once every attempt has failed
+        """
+        if fixtures.MODE is not None:
+            response = self._fixture_request(method, url, params, headers, timeout, retries, description)
+        elif method == "GET" and cache and self.cache is not None:
+            response = self._cached_get(url, params, headers, timeout, retries, description)
+        else:
+            response = self._send(method, url, params, headers, timeout, retries, description)
+        if method == "GET":
+            self.body_hashes[resolve_url(url, params)] = hashlib.sha256(response.content).hexdigest()
+        return response
+
+    def _cached_get(self, url, params, headers, timeout, retries, description):
+        full_url = resolve_url(url, params)
+        validators = self.cache.validators(full_url)
+        response = self._send("GET", url, params, {**(headers or {}), **validators},
+                              timeout, retries, description)
+
+        if response.status_code == 304:
+            cached = self.cache.load(full_url)
+            if cached is None:
+                # Cache entry vanished between revalidation and load: fetch in full
+                response = self._send("GET", url, params, headers, timeout, retries, description)
+            else:
+                meta, body = cached
+                response = requests.Response()
+                response.status_code = 200
+                response._content = body
+                response.url = full_url
+                response.encoding = meta.get("encoding")
+                if meta.get("content_type"):
+                    response.headers["Content-Type"] = meta["content_type"]
+                response.from_cache = True
+                self.modified[full_url] = False
+                return response
+
+        self.cache.store(full_url, response)
+        response.from_cache = False
+        self.modified[full_url] = True
+        return response
+
+    def _fixture_request(self, method, url, params, headers, timeout, retries, description):
+        """Record mode: send and save the response; replay mode: serve the saved one offline"""
+        full_url = resolve_url(url, params)
+        if fixtures.MODE == "replay":
+            start = time.monotonic()
+            response = fixtures.load_response(method, full_url)
+            self._record(full_url, urlsplit(full_url).netloc, response.status_code, len(response.content),
+                         time.monotonic() - start, 1)
+        else:
+            response = self._send(method, url, params, headers, timeout, retries, description)
+            fixtures.save_response(method, full_url, response)
+        response.from_cache = False
+        self.modified[full_url] = True
+        return response
+
+    def _send(self, method, url, params, headers, timeout, retries, description):
+        host = urlsplit(url).netloc
+        retries = self.max_retries if retries is None else retries
+        description = description or url
+        start = time.monotonic()
+
+        for attempt in range(retries):
+            try:
+                with self._host_semaphore(host):
+                    self._wait_for_slot(host)
+                    response = self._session.request(method, url, params=params, headers=headers, timeout=timeout)
+                if response.status_code in RETRY_STATUS and attempt < retries - 1:
+                    raise requests.HTTPError(f"{response.status_code} from {host}", response=response)
+                response.raise_for_status()
+            except requests.RequestException as e:
+                status = e.response.status_code if e.response is not None else None
+                retryable = status is None or status in RETRY_STATUS
+                if not retryable or attempt == retries - 1:
+                    self._record(url, host, status, 0, time.monotonic() - start, attempt + 1)
+                    raise
+                delay = random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+                print(f"  Attempt {attempt + 1}/{retries} failed for {description}: {e}")
+                print(f"  Retrying in {delay:.1f} seconds...")
+                time.sleep(delay)
+                continue
+
+            self._record(url, host, response.status_code, len(response.content),
+                         time.monotonic() - start, attempt + 1)
+            return response
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def get_json(self, url, **kwargs):
+        return self.get(url, **kwargs).json()
+
+    def get_text(self, url, **kwargs):
+        return self.get(url, **kwargs).text
+
+    def summary(self):
+        """Aggregate request count, bytes and latency per host"""
+        hosts = {}
+        with self._lock:
+            for entry in self.stats:
+                host = hosts.setdefault(entry["host"], {"requests": 0, "not_modified": 0, "bytes": 0, "seconds": 0.0})
+                host["requests"] += 1
+                host["not_modified"] += entry["status"] == 304
+                host["bytes"] += entry["bytes"]
+                host["seconds"] += entry["seconds"]
+        return hosts
+
+    def print_summary(self):
+        hosts = self.summary()
+        if not hosts:
+            return
+        print(f"\nHTTP summary:")
+        for host, totals in sorted(hosts.items()):
+            print(f"  {host}: {totals['requests']} requests ({totals['not_modified']} not modified), "
+                  f"{totals['bytes'] / 1024:,.0f} KB, {totals['seconds']:.1f}s")
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """Process-wide client, created on first use"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient(cache=ResponseCache() if CACHE_ENABLED else None)
+            atexit.register(_client.print_summary)
+        return _client
+
+
+def get(url, **kwargs):
+    return get_client().get(url, **kwargs)
+
+
+def get_json(url, **kwargs):
+    return get_client().get_json(url, **kwargs)
+
+
+def get_text(url, **kwargs):
+    return get_client().get_text(url, **kwargs)
+
+
+def upstream_changed(urls):
+    """False only when every URL was last served from cache after a 304"""
+    modified = get_client().modified
+    return any(modified.get(resolve_url(url), True) for url in urls)
+
+
+def upstream_hashes(urls, *scripts):
+    """
+    What an output built from these URLs depends on, for build_cache.record and
+    skip_if_unchanged: one hash over the bodies served for the URLs in this run
+    (None when one was not fetched) and the file hash of each building script
+    """
+    bodies = get_client().body_hashes
+    digest = hashlib.sha256()
+    for url in sorted(resolve_url(url) for url in urls):
+        if url not in bodies:
+            digest = None
+            break
+        digest.update(f"{url} {bodies[url]}\n".encode("utf-8"))
+    return {"upstream": digest.hexdigest() if digest else None, **build_cache.script_hashes(*scripts)}
+
+
+def skip_if_unchanged(urls, output_file, hashes):
+    """
+    Raise UpstreamUnchanged when all URLs revalidated as 304 and output_file
+    records these upstream_hashes, i.e. it was built from the same bodies by the
+    same scripts. An output missing, left behind by a failed run or built by an
+    older script is rebuilt from the cached bodies
+    """
+    if not upstream_changed(urls) and build_cache.is_up_to_date(output_file, hashes):
+        raise UpstreamUnchanged(f"Upstream data unchanged (304), keeping {os.path.basename(output_file)}")
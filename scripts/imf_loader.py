@@ -0,0 +1,171 @@
+"""
+IMF DataMapper indicator loader
+Downloads each indicator once per run and memoizes it in-process and on disk
+(.cache/imf), so the GDP, Debt, Debt/GDP and Employment builders share downloads
+whether they run in one process or as consecutive scripts. The disk memo is
+tied to the run id in PIPELINE_RUN_ID (set by run_pipeline.py and
+fetch_imf_all.py): a later run, or a script run without a run id, downloads
+(revalidates) again
+Several indicators are requested in one round trip (/api/v1/NGDPD/GGXWDG_NGDP/LUR)
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+
+import build_cache
+import compact_json
+import http_client
+
+IMF_API_BASE = "https://www.imf.org/external/datamapper/api/v1"
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+MEMO_DIR = os.path.join(SCRIPT_DIR, "..", ".cache", "imf")
+RUN_ID_ENV = "PIPELINE_RUN_ID"
+
+# Every indicator used by the IMF metric builders
+IMF_INDICATORS = ["GGXWDG_NGDP", "NGDPD", "LUR"]
+
+_memo = {}
+_lock = threading.Lock()
+
+
+def indicators_url(indicators):
+    return f"{IMF_API_BASE}/{'/'.join(indicators)}"
+
+
+def _memo_path(indicator):
+    return os.path.join(MEMO_DIR, f"{indicator}.json")
+
+
+def run_id():
+    """Id of the current pipeline run, or None outside one"""
+    return os.environ.get(RUN_ID_ENV) or None
+
+
+def _read_disk_memo(indicator):
+    """Memo entry saved by an earlier process of this run, if any"""
+    if run_id() is None:
+        return None
+    try:
+        with open(_memo_path(indicator), "r", encoding="utf-8") as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return entry if entry.get("run_id") == run_id() else None
+
+
+def _write_disk_memo(indicator, entry):
+    os.makedirs(MEMO_DIR, exist_ok=True)
+    compact_json.write_atomic(_memo_path(indicator), json.dumps(entry, ensure_ascii=False).encode("utf-8"))
+
+
+def values_hash(values):
+    """SHA-256 of an indicator's values, independent of how it was batched"""
+    return hashlib.sha256(json.dumps(values, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _download(indicators):
+    """Fetch one or more indicators in a single request, returning memo entries"""
+    url = indicators_url(indicators)
+    print(f"Downloading {', '.join(indicators)} from IMF...")
+    print(f"URL: {url}\n")
+    response = http_client.get(url, description=f"IMF {', '.join(indicators)}")
+    payload = response.json().get("values", {})
+    changed = not getattr(response, "from_cache", False)
+    return {
+        indicator: {
+            "indicator": indicator,
+            "run_id": run_id(),
+            "downloaded_at": time.time(),
+            "changed": changed,
+            "hash": values_hash(payload.get(indicator, {})),
+            "values": payload.get(indicator, {})
+        }
+        for indicator in indicators
+    }
+
+
+def _load_entries(indicators):
+    """Memo entries for the indicators, downloading all missing ones in one batch"""
+    with _lock:
+        missing = []
+        for indicator in indicators:
+            if indicator in _memo:
+                continue
+            entry = _read_disk_memo(indicator) if http_client.CACHE_ENABLED else None
+            if entry is not None:
+                print(f"Using {indicator} downloaded earlier in this run")
+                _memo[indicator] = entry
+            else:
+                missing.append(indicator)
+
+        if missing:
+            entries = _download(missing)
+            # Fall back to single requests for anything the batched payload lacked
+            if len(missing) > 1:
+                for indicator in missing:
+                    if not entries[indicator]["values"]:
+                        entries.update(_download([indicator]))
+            for indicator, entry in entries.items():
+                _memo[indicator] = entry
+                if http_client.CACHE_ENABLED and run_id() is not None:
+                    _write_disk_memo(indicator, entry)
+
+        return {indicator: _memo[indicator] for indicator in indicators}
+
+
+def load_indicators(indicators):
+    """
+    {indicator: country -> {year: value}} for several IMF DataMapper indicators
+    Raises ValueError when an indicator has no data
+    """
+    entries = _load_entries(indicators)
+    for indicator, entry in entries.items():
+        if not entry["values"]:
+            raise ValueError(f"No data found for IMF indicator {indicator}")
+    return {indicator: entry["values"] for indicator, entry in entries.items()}
+
+
+def load_indicator(indicator):
+    """
+    Country -> {year: value} mapping for an IMF DataMapper indicator
+    Raises ValueError when the indicator has no data
+    """
+    return load_indicators([indicator])[indicator]
+
+
+def indicator_changed(indicator):
+    """False when the indicator's last download revalidated as 304 Not Modified"""
+    return _load_entries([indicator])[indicator]["changed"]
+
+
+def upstream_hashes(indicators, *scripts):
+    """
+    What an output built from these indicators depends on, for
+    build_cache.record and skip_if_unchanged: a hash over the indicators'
+    values and the file hash of each building script
+    """
+    entries = _load_entries(indicators)
+    digest = hashlib.sha256()
+    for indicator in sorted(indicators):
+        entry_hash = entries[indicator].get("hash")
+        if entry_hash is None:
+            digest = None
+            break
+        digest.update(f"{indicator} {entry_hash}\n".encode("utf-8"))
+    return {"upstream": digest.hexdigest() if digest else None, **build_cache.script_hashes(*scripts)}
+
+
+def skip_if_unchanged(indicators, output_file, hashes):
+    """
+    Raise http_client.UpstreamUnchanged when no indicator changed (304) and
+    output_file records these upstream_hashes: built from the same values by
+    the same scripts. Otherwise the output is rebuilt from the cached values
+    """
+    if (not any(indicator_changed(i) for i in indicators)
+            and build_cache.is_up_to_date(output_file, hashes)):
+        raise http_client.UpstreamUnchanged(
+            f"IMF data unchanged (304), keeping {os.path.basename(output_file)}"
+        )
@@ -0,0 +1,208 @@
+"""
+Declarative IMF DataMapper metric builder
+Each metric is a config entry (indicators, value formula, rounding, output file);
+build_metric walks the raw payload once and fills both the per-year rankings
+(`data`) and the per-country `timeseries`
+"""
+
+import os
+from datetime import datetime
+
+import requests
+
+import build_cache
+import compact_json
+import http_client
+import imf_loader
+import shards
+from country_mappings import COUNTRY_NAMES, REGIONS, CURRENT_YEAR
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(SCRIPT_DIR, "..", "data")
+
+# Years kept in the output (most recent first)
+MAX_YEARS = 25
+
+# Metric configs
+# - indicators: IMF indicator codes; years come from the first one
+# - compute: value from one float per indicator (same order), then rounded to `ndigits`
+IMF_METRICS = {
+    "debt_gdp": {
+        "name": "Debt/GDP",
+        "indicators": ["GGXWDG_NGDP"],
+        "compute": lambda ratio: ratio,
+        "ndigits": 1,
+        "value_key": "debt",
+        "output_file": os.path.join(DATA_DIR, "imf_debt_data.json"),
+        "indicator_label": "GGXWDG_NGDP",
+        "description": "General Government Gross Debt (% of GDP)",
+        "summary_title": "Top 10 countries by Debt/GDP",
+        "summary_format": lambda value: f"{value}%"
+    },
+    "gdp": {
+        "name": "GDP",
+        "indicators": ["NGDPD"],
+        "compute": lambda gdp: gdp * 1e9,  # Convert billions to actual USD
+        "ndigits": 0,
+        "value_key": "value",
+        "output_file": os.path.join(DATA_DIR, "gdp_data.json"),
+        "indicator_label": "NGDPD",
+        "description": "GDP, current prices (USD billions)",
+        "summary_title": "Top 10 countries by GDP",
+        "summary_format": lambda value: f"${value/1e12:.2f}T"
+    },
+    "debt": {
+        "name": "Public Debt",
+        "indicators": ["NGDPD", "GGXWDG_NGDP"],
+        # GDP is in billions, ratio is %, so debt = gdp * ratio / 100 (then to actual USD)
+        "compute": lambda gdp, ratio: gdp * ratio / 100 * 1e9,
+        "ndigits": 0,
+        "value_key": "value",
+        "output_file": os.path.join(DATA_DIR, "debt_data.json"),
+        "indicator_label": "NGDPD * GGXWDG_NGDP / 100",
+        "description": "General government gross debt (USD billions, calculated)",
+        "summary_title": "Top 10 countries by Public Debt",
+        "summary_format": lambda value: f"${value/1e12:.2f}T"
+    },
+    "employment": {
+        "name": "Unemployment",
+        "indicators": ["LUR"],
+        "compute": lambda rate: rate,
+        "ndigits": 2,
+        "value_key": "value",
+        "output_file": os.path.join(DATA_DIR, "employment_data.json"),
+        "indicator_label": "LUR",
+        "description": "Unemployment rate (% of labor force)",
+        "summary_title": "Top 10 countries with highest unemployment",
+        "summary_format": lambda value: f"{value}%"
+    }
+}
+
+
+def all_indicators(metrics=None):
+    """Unique indicator codes needed by the given metrics, in first-use order"""
+    indicators = []
+    for metric in (metrics or IMF_METRICS.values()):
+        for indicator in metric["indicators"]:
+            if indicator not in indicators:
+                indicators.append(indicator)
+    return indicators
+
+
+def build_metric(metric):
+    """Build the {metadata, data, timeseries} structure for one metric config"""
+    indicators = metric["indicators"]
+    value_key = metric["value_key"]
+
+    print(f"Loading {metric['name']} data from IMF...")
+    series = imf_loader.load_indicators(indicators)
+    hashes = imf_loader.upstream_hashes(indicators, __file__, shards.__file__)
+    imf_loader.skip_if_unchanged(indicators, metric["output_file"], hashes)
+
+    primary = series[indicators[0]]
+    secondary = [series[indicator] for indicator in indicators[1:]]
+
+    all_years = set()
+    for country_data in primary.values():
+        all_years.update(country_data.keys())
+
+    years = sorted([y for y in all_years if y.isdigit()], reverse=True)
+
+    real_years = [y for y in years if int(y) <= CURRENT_YEAR]
+    projection_years = [y for y in years if int(y) > CURRENT_YEAR]
+
+    print(f"Years with real data: {real_years[-1] if real_years else 'N/A'} - {real_years[0] if real_years else 'N/A'}")
+    print(f"Years with projections: {projection_years[-1] if projection_years else 'N/A'} - {projection_years[0] if projection_years else 'N/A'}")
+
+    window = years[:MAX_YEARS]
+    result = {
+        "metadata": {
+            "source": "IMF DataMapper",
+            "indicator": metric["indicator_label"],
+            "description": metric["description"],
+            "fetched_at": datetime.now().isoformat(),
+            "available_years": window,
+            "last_real_year": str(CURRENT_YEAR),
+            "projection_years": projection_years
+        },
+        "data": {year: [] for year in window},
+        "timeseries": {}
+    }
+
+    # Single pass: every (country, year) value feeds both views
+    for code, values in primary.items():
+        if code not in COUNTRY_NAMES:
+            continue
+
+        country = COUNTRY_NAMES[code]
+        region = REGIONS.get(code, "Other")
+        other_values = [other.get(code, {}) for other in secondary]
+
+        points = []
+        for year in sorted(window):
+            raw = [values.get(year)] + [other.get(year) for other in other_values]
+            if any(r is None for r in raw):
+                continue
+            try:
+                value = round(metric["compute"](*[float(r) for r in raw]), metric["ndigits"])
+            except (ValueError, TypeError):
+                continue
+
+            is_projection = int(year) > CURRENT_YEAR
+            result["data"][year].append({
+                "code": code,
+                "country": country,
+                value_key: value,
+                "region": region,
+                "isProjection": is_projection
+            })
+            points.append({
+                "year": year,
+                value_key: value,
+                "isProjection": is_projection
+            })
+
+        if points:
+            result["timeseries"][code] = {
+                "country": country,
+                "region": region,
+                "data": points
+            }
+
+    for year in window:
+        result["data"][year].sort(key=lambda x: -x[value_key])
+        print(f"  {year}: {len(result['data'][year])} countries {'(projection)' if int(year) > CURRENT_YEAR else ''}")
+
+    return build_cache.record(result, hashes)
+
+
+def run_metric(metric):
+    """
+    Build a metric, save it to its output file and print a summary
+    Returns False when the metric could not be built
+    """
+    try:
+        data = build_metric(metric)
+
+        compact_json.write_json(data, metric["output_file"])
+        shards.write_shards(data, metric["output_file"])
+
+        print(f"\nData saved to: {metric['output_file']}")
+        print(f"Total years: {len(data['data'])}")
+        print(f"Total countries: {len(data['timeseries'])}")
+
+        latest_year = data["metadata"]["last_real_year"]
+        if latest_year in data["data"]:
+            print(f"\n{metric['summary_title']} ({latest_year}):")
+            for i, country in enumerate(data["data"][latest_year][:10], 1):
+                print(f"  {i}. {country['country']}: {metric['summary_format'](country[metric['value_key']])}")
+
+    except http_client.UpstreamUnchanged as e:
+        print(e)
+    except requests.RequestException as e:
+        print(f"Connection error: {e}")
+        return False
+    except Exception as e:
+        print(f"Error: {e}")
+        return False
+    return True
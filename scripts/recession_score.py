@@ -0,0 +1,292 @@
+"""
+Vectorized recession risk score
+Run: python recession_score.py [--start 1970-01]
+
+The six-indicator model of the Recession Indicators page applied to aligned
+NumPy arrays: every component score and the weighted score are computed for
+all dates in one pass. A NaN input means no data for that date; the component
+is then left out and the remaining weights renormalized, as the page does for
+zones without data
+
+monthly_history() builds the US inputs from FRED (through fred_store) on a
+monthly grid, so the model can be scored over 1970-today; inputs_at() builds
+them for arbitrary as-of dates
+"""
+
+import argparse
+import sys
+from datetime import datetime
+
+import numpy as np
+
+import fred_store
+
+WEIGHTS = {
+    "yield": 0.30,
+    "pmi": 0.20,
+    "spreads": 0.15,
+    "confidence": 0.15,
+    "claims": 0.10,
+    "bigmac": 0.10
+}
+
+# Thresholds of the model; a parameter sweep passes its own copy
+DEFAULT_PARAMS = {
+    "weights": WEIGHTS,
+    "inversion_rate": 0.5,  # share of inverted curves above which the yield score rises
+    "deep_inversion": -0.5,  # average 10Y-2Y spread (pp) below which it rises further
+    "pmi_expansion": 50,
+    "pmi_contraction_rate": 0.3,
+    "credit_spread_floor": 100,  # bps
+    "credit_high_risk": 500,  # bps; a series above it is high risk
+    "credit_high_risk_rate": 0.1,
+    "claims_high_risk": 20,  # % above baseline; a series above it is high risk
+    "claims_high_risk_rate": 0.2,
+    "bigmac_full_stress": 60  # % affordability stress scoring 100
+}
+
+# Input arrays understood by component_scores (missing ones count as no data)
+INPUTS = (
+    "inverted_rate", "yield_spread",
+    "pmi", "pmi_contraction_rate",
+    "credit_spread", "credit_high_risk_rate",
+    "confidence",
+    "claims_stress", "claims_high_risk_rate",
+    "bigmac_stress"
+)
+
+# US series used by monthly_history and inputs_at
+HISTORY_SERIES = {
+    "t10": "DGS10",
+    "t2": "DGS2",
+    "high_yield": "BAMLH0A0HYM2",
+    "confidence": "CSCICP02USAM460S",
+    "claims": "ICSA"
+}
+CLAIMS_BASELINE_MONTHS = 12
+CLAIMS_BASELINE_WEEKS = 52  # weekly claims needed in the year before an as-of date
+
+
+def _input(inputs, name, length):
+    value = inputs.get(name)
+    if value is None:
+        return np.full(length, np.nan)
+    return np.asarray(value, dtype=float)
+
+
+def _derived_rate(inputs, name, level, above, length):
+    """
+    Share of series past a threshold; for a single series (history inputs)
+    derived from its level as 1.0 or 0.0
+    """
+    if inputs.get(name) is not None:
+        return _input(inputs, name, length)
+    with np.errstate(invalid="ignore"):
+        return np.where(np.isnan(level), np.nan, (level > above).astype(float))
+
+
+def component_scores(inputs, params=DEFAULT_PARAMS):
+    """
+    Component scores (0-100, NaN without data) for every date at once
+    inputs: name (see INPUTS) -> array, all the same length
+    """
+    length = max(np.size(value) for value in inputs.values() if value is not None)
+    get = lambda name: _input(inputs, name, length)
+
+    spread = get("yield_spread")
+    inverted = _derived_rate(inputs, "inverted_rate", -spread, 0, length)
+    credit = get("credit_spread")
+    credit_rate = _derived_rate(inputs, "credit_high_risk_rate", credit, params["credit_high_risk"], length)
+    claims = get("claims_stress")
+    claims_rate = _derived_rate(inputs, "claims_high_risk_rate", claims, params["claims_high_risk"], length)
+    pmi = get("pmi")
+    contraction = get("pmi_contraction_rate")
+    confidence = get("confidence")
+    bigmac = get("bigmac_stress")
+
+    with np.errstate(invalid="ignore"):
+        deep = params["deep_inversion"]
+        yield_score = (np.where(inverted > params["inversion_rate"], (inverted - params["inversion_rate"]) * 2 * 70, 0)
+                       + np.where(spread < deep, np.minimum(30, np.abs(spread - deep) * 30), 0))
+        yield_score = np.where(np.isnan(inverted) & np.isnan(spread), np.nan, yield_score)
+
+        expansion = params["pmi_expansion"]
+        pmi_score = (np.where(pmi < expansion, np.minimum(100, (expansion - pmi) * 10), 0)
+                     + np.where(contraction > params["pmi_contraction_rate"], contraction * 25, 0))
+        pmi_score = np.where(np.isnan(pmi), np.nan, np.minimum(100, pmi_score))
+
+        floor = params["credit_spread_floor"]
+        spread_score = (np.where(credit > floor, np.minimum(100, (credit - floor) / 4), 0)
+                        + np.where(credit_rate > params["credit_high_risk_rate"], credit_rate * 40, 0))
+        spread_score = np.where(np.isnan(credit), np.nan, np.minimum(100, spread_score))
+
+        conf_score = np.where(confidence < 0, np.minimum(100, 10 + np.abs(confidence) * 3.5), 0)
+        conf_score = np.where(np.isnan(confidence), np.nan, conf_score)
+
+        claims_score = (np.where(claims > 0, np.minimum(100, claims * 3), 0)
+                        + np.where(claims_rate > params["claims_high_risk_rate"], claims_rate * 30, 0))
+        claims_score = np.where(np.isnan(claims), np.nan, np.minimum(100, claims_score))
+
+        bigmac_score = np.minimum(100, (bigmac / params["bigmac_full_stress"]) * 100)
+
+    return {
+        "yield": yield_score,
+        "pmi": pmi_score,
+        "spreads": spread_score,
+        "confidence": conf_score,
+        "claims": claims_score,
+        "bigmac": bigmac_score
+    }
+
+
+def weighted_score(components, weights=WEIGHTS):
+    """Weighted average of the available components, 0-100 (NaN when none is available)"""
+    stacked = np.stack([components[name] for name in weights])
+    w = np.array([weights[name] for name in weights])[:, None]
+    available = ~np.isnan(stacked)
+    total_weight = (w * available).sum(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        score = np.where(available, stacked * w, 0).sum(axis=0) / total_weight
+    return np.clip(np.where(total_weight > 0, score, np.nan), 0, 100)
+
+
+def score(inputs, params=DEFAULT_PARAMS):
+    """(weighted scores, component scores) for every date in `inputs`"""
+    components = component_scores(inputs, params)
+    return weighted_score(components, params["weights"]), components
+
+
+def score_point(data, params=DEFAULT_PARAMS):
+    """
+    Score of one hand-built point in the page's shape
+    ({"yield_curve": {"inverted_rate", "avg_spread"}, "pmi": {...}, ...})
+    Returns (rounded score, component scores rounded to 0.1)
+    """
+    inputs = {
+        "inverted_rate": [data["yield_curve"]["inverted_rate"]],
+        "yield_spread": [data["yield_curve"]["avg_spread"]],
+        "pmi": [data["pmi"]["avg_value"]],
+        "pmi_contraction_rate": [data["pmi"]["contraction_rate"]],
+        "credit_spread": [data["credit_spreads"]["avg_spread"]],
+        "credit_high_risk_rate": [data["credit_spreads"]["high_risk_rate"]],
+        "confidence": [data["consumer_confidence"]["avg_value"]],
+        "claims_stress": [data["unemployment_claims"]["avg_stress"]],
+        "claims_high_risk_rate": [data["unemployment_claims"]["high_risk_rate"]],
+        "bigmac_stress": [data["big_mac"]["avg_stress"]]
+    }
+    scores, components = score(inputs, params)
+    return round(float(scores[0])), {name: round(float(value[0]), 1) for name, value in components.items()}
+
+
+def monthly_values(dates, values, months):
+    """Last observation of each month in `months` (NaN for months without one)"""
+    observed = np.array(dates, dtype="datetime64[M]")
+    values = np.asarray(values, dtype=float)
+    last = np.searchsorted(observed, months, side="right") - 1
+    result = np.full(len(months), np.nan)
+    found = last >= 0
+    found[found] = observed[last[found]] == months[found]
+    result[found] = values[last[found]]
+    return result
+
+
+def trailing_mean(values, window):
+    """Mean of the `window` previous values (NaN until a full window is available)"""
+    valid = ~np.isnan(values)
+    sums = np.concatenate([[0.0], np.cumsum(np.where(valid, values, 0.0))])
+    counts = np.concatenate([[0], np.cumsum(valid)])
+    end = np.arange(len(values))
+    start = np.maximum(0, end - window)
+    count = counts[end] - counts[start]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(count == window, (sums[end] - sums[start]) / count, np.nan)
+
+
+def monthly_history(start="1970-01", end=None):
+    """
+    US model inputs on a monthly grid from FRED
+    yield_spread: 10Y - 2Y Treasury (pp); credit_spread: ICE BofA US High Yield
+    OAS (bps); confidence: OECD consumer confidence - 100; claims_stress: initial
+    claims vs their previous 12-month average (%). PMI and Big Mac have no free
+    history and stay NaN
+    Returns (months as datetime64[M], inputs)
+    """
+    end = end or datetime.now().strftime("%Y-%m")
+    months = np.arange(np.datetime64(start, "M"), np.datetime64(end, "M") + 1)
+
+    fred_store.prefetch(HISTORY_SERIES.values())
+    series = {name: monthly_values(*fred_store.get_observations(series_id), months)
+              for name, series_id in HISTORY_SERIES.items()}
+
+    claims = series["claims"]
+    baseline = trailing_mean(claims, CLAIMS_BASELINE_MONTHS)
+    inputs = {
+        "yield_spread": series["t10"] - series["t2"],
+        "credit_spread": series["high_yield"] * 100,
+        "confidence": series["confidence"] - 100,
+        "claims_stress": (claims / baseline - 1) * 100
+    }
+    return months, inputs
+
+
+def inputs_at(dates):
+    """
+    US model inputs as of arbitrary dates (datetime64[D] array), one vectorized
+    pass per FRED series: each input uses the latest observation on or before
+    the date and is NaN when there is none recent enough (fred_store.as_of);
+    claims_stress compares claims with their mean over the previous year and
+    is NaN without a full year of claims
+    Returns (inputs, {series_id: observation dates used, NaT where none})
+    """
+    dates = np.asarray(dates, dtype="datetime64[D]")
+    fred_store.prefetch(HISTORY_SERIES.values())
+    values = {}
+    observed = {}
+    for name, series_id in HISTORY_SERIES.items():
+        observed[series_id], values[name] = fred_store.as_of_many(series_id, dates)
+
+    claims_dates, claims_values = fred_store.get_observations(HISTORY_SERIES["claims"])
+    claims_dates = np.array(claims_dates, dtype="datetime64[D]")
+    sums = np.concatenate([[0.0], np.cumsum(claims_values)])
+    start = np.searchsorted(claims_dates, dates - np.timedelta64(365, "D"))
+    end = np.searchsorted(claims_dates, dates)
+    count = end - start
+    with np.errstate(invalid="ignore", divide="ignore"):
+        baseline = np.where(count >= CLAIMS_BASELINE_WEEKS, (sums[end] - sums[start]) / count, np.nan)
+
+    inputs = {
+        "yield_spread": values["t10"] - values["t2"],
+        "credit_spread": values["high_yield"] * 100,
+        "confidence": values["confidence"] - 100,
+        "claims_stress": (values["claims"] / baseline - 1) * 100
+    }
+    return inputs, observed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score the recession model over monthly US history")
+    parser.add_argument("--start", default="1970-01", help="First month (YYYY-MM)")
+    parser.add_argument("--end", default=None, help="Last month (YYYY-MM, default: current)")
+    args = parser.parse_args()
+
+    print("Loading FRED history...")
+    months, inputs = monthly_history(args.start, args.end)
+    scores, components = score(inputs)
+
+    print(f"\n{'Year':<6} {'Avg':>5} {'Max':>5}  {'Months >= 70':>12}")
+    print("-" * 34)
+    years = months.astype("datetime64[Y]")
+    for year in np.unique(years):
+        year_scores = scores[years == year]
+        if np.isnan(year_scores).all():
+            continue
+        high = int(np.sum(year_scores >= 70))
+        print(f"{str(year):<6} {np.nanmean(year_scores):5.0f} {np.nanmax(year_scores):5.0f}  {high:>12}")
+
+    scored = int(np.sum(~np.isnan(scores)))
+    print(f"\nScored {scored} of {len(months)} months")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,220 @@
+"""
+Recession Score Parameter Sweep
+Run: python recession_sweep.py [--start 1970-01] [--workers N] [--sample 2000] [--top 20]
+
+Scores the monthly US history (recession_score.monthly_history) under every
+combination of weights and thresholds in SWEEP_GRID and compares each against
+the NBER recessions: a recession is hit when the score reaches the alarm level
+within LEAD_MONTHS before it starts; the lead time is how early the first
+alarm came; alarm episodes outside every warning window are false positives.
+Combinations are evaluated on a process pool. The input series the history
+has are written once to .cache/sweep/inputs.npy (their names to inputs.json)
+and every worker maps that same file read-only instead of receiving its own
+copy.
+Writes every combination's results to .cache/sweep/results.csv
+"""
+
+import argparse
+import csv
+import io
+import itertools
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import compact_json
+import recession_score
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+SWEEP_DIR = os.path.join(SCRIPT_DIR, "..", ".cache", "sweep")
+INPUTS_FILE = os.path.join(SWEEP_DIR, "inputs.npy")
+RESULTS_FILE = os.path.join(SWEEP_DIR, "results.csv")
+
+# NBER business cycle peaks and troughs (months), 1970 on
+NBER_RECESSIONS = [
+    ("1969-12", "1970-11"),
+    ("1973-11", "1975-03"),
+    ("1980-01", "1980-07"),
+    ("1981-07", "1982-11"),
+    ("1990-07", "1991-03"),
+    ("2001-03", "2001-11"),
+    ("2007-12", "2009-06"),
+    ("2020-02", "2020-04")
+]
+LEAD_MONTHS = 12  # an alarm up to a year before the peak counts as a warning
+
+# Values tried for each parameter; weights are given before normalization.
+# Only components with history (yield curve, spreads, confidence, claims) vary
+SWEEP_GRID = {
+    "weight_yield": [0.1, 0.2, 0.3, 0.4],
+    "weight_spreads": [0.1, 0.15, 0.25, 0.35],
+    "weight_confidence": [0.05, 0.15, 0.25, 0.35],
+    "weight_claims": [0.05, 0.1, 0.2, 0.3],
+    "deep_inversion": [-1.0, -0.5, 0.0],
+    "credit_high_risk": [400, 500, 600, 700],
+    "claims_high_risk": [10, 20, 30],
+    "alarm": [40, 50, 60]
+}
+
+# The current model's parameters as a sweep combination (alarm at HIGH RISK)
+DEFAULT_COMBO = {
+    "weight_yield": 0.3, "weight_spreads": 0.15, "weight_confidence": 0.15, "weight_claims": 0.1,
+    "deep_inversion": -0.5, "credit_high_risk": 500, "claims_high_risk": 20, "alarm": 70
+}
+
+RESULT_FIELDS = list(SWEEP_GRID) + ["hits", "recessions", "hit_rate", "avg_lead_months", "false_positives"]
+
+# Worker state, set once per process by _init_worker
+_inputs = None
+_recessions = None
+
+
+def combinations(grid=SWEEP_GRID, sample=None, seed=0):
+    """Every combination of the grid (or a reproducible random sample of them)"""
+    names = list(grid)
+    combos = [dict(zip(names, values)) for values in itertools.product(*grid.values())]
+    if sample and sample < len(combos):
+        combos = random.Random(seed).sample(combos, sample)
+    return combos
+
+
+def to_params(combo):
+    """recession_score params for one sweep combination"""
+    params = dict(recession_score.DEFAULT_PARAMS)
+    weights = dict(recession_score.WEIGHTS)
+    for name in ("yield", "spreads", "confidence", "claims"):
+        weights[name] = combo[f"weight_{name}"]
+    params["weights"] = weights
+    for name in ("deep_inversion", "credit_high_risk", "claims_high_risk"):
+        params[name] = combo[name]
+    return params
+
+
+def recession_windows(months, recessions=NBER_RECESSIONS, lead=LEAD_MONTHS):
+    """(warning start, peak, trough) month indices of the recessions inside `months`"""
+    windows = []
+    for peak, trough in recessions:
+        p = int(np.searchsorted(months, np.datetime64(peak, "M")))
+        t = int(np.searchsorted(months, np.datetime64(trough, "M")))
+        if 0 < p < len(months):
+            windows.append((max(0, p - lead), p, min(t, len(months) - 1)))
+    return windows
+
+
+def evaluate(scores, alarm, windows):
+    """Hit count, mean lead time (months) and false-positive alarm episodes"""
+    alarms = scores >= alarm  # NaN compares False
+
+    hits = 0
+    leads = []
+    expected = np.zeros(len(scores), dtype=bool)
+    for warn, peak, trough in windows:
+        expected[warn:trough + 1] = True
+        first = np.flatnonzero(alarms[warn:peak + 1])
+        if first.size:
+            hits += 1
+            leads.append(peak - (warn + int(first[0])))
+
+    # Episodes = runs of consecutive alarm months; false when starting outside every window
+    starts = np.flatnonzero(alarms & ~np.concatenate([[False], alarms[:-1]]))
+    false_positives = int(np.sum(~expected[starts]))
+    return hits, (float(np.mean(leads)) if leads else None), false_positives
+
+
+def _init_worker(inputs_file, windows):
+    """
+    Map the saved inputs read-only; only the inputs that were saved are given,
+    so rates such as inverted_rate are still derived from their level series
+    """
+    global _inputs, _recessions
+    matrix = np.load(inputs_file, mmap_mode="r")
+    with open(f"{inputs_file[:-4]}.json", "r", encoding="utf-8") as f:
+        names = json.load(f)
+    _inputs = {name: matrix[i] for i, name in enumerate(names)}
+    _recessions = windows
+
+
+def evaluate_combo(combo):
+    scores, _ = recession_score.score(_inputs, to_params(combo))
+    hits, lead, false_positives = evaluate(scores, combo["alarm"], _recessions)
+    return {
+        **combo,
+        "hits": hits,
+        "recessions": len(_recessions),
+        "hit_rate": round(hits / len(_recessions), 3) if _recessions else None,
+        "avg_lead_months": round(lead, 1) if lead is not None else None,
+        "false_positives": false_positives
+    }
+
+
+def save_inputs(inputs, inputs_file=INPUTS_FILE):
+    """
+    Stack the available input series into one float array on disk, their names
+    (in row order) next to it; inputs the history lacks are left out, not NaN
+    """
+    os.makedirs(os.path.dirname(inputs_file), exist_ok=True)
+    names = [name for name in recession_score.INPUTS if inputs.get(name) is not None]
+    matrix = np.array([np.asarray(inputs[name], dtype=float) for name in names])
+    buffer = io.BytesIO()
+    np.save(buffer, matrix)
+    compact_json.write_atomic(inputs_file, buffer.getvalue())
+    compact_json.write_atomic(f"{inputs_file[:-4]}.json", json.dumps(names).encode("utf-8"))
+
+
+def rank_key(result):
+    lead = result["avg_lead_months"] or 0
+    return (-(result["hit_rate"] or 0), result["false_positives"], -lead)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep recession score weights and thresholds against NBER recessions")
+    parser.add_argument("--start", default="1970-01", help="First month (YYYY-MM)")
+    parser.add_argument("--end", default=None, help="Last month (YYYY-MM, default: current)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Worker processes")
+    parser.add_argument("--sample", type=int, default=None, help="Evaluate a random sample of N combinations")
+    parser.add_argument("--top", type=int, default=20, help="Combinations to print")
+    args = parser.parse_args()
+
+    print("Loading FRED history...")
+    months, inputs = recession_score.monthly_history(args.start, args.end)
+    save_inputs(inputs)
+    windows = recession_windows(months)
+    print(f"  {len(months)} months ({months[0]} to {months[-1]}), {len(windows)} NBER recessions")
+
+    combos = combinations(sample=args.sample)
+    print(f"Evaluating {len(combos)} combinations on {args.workers} workers...")
+    start = time.monotonic()
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker,
+                             initargs=(INPUTS_FILE, windows)) as executor:
+        chunksize = max(1, len(combos) // (args.workers * 8))
+        results = list(executor.map(evaluate_combo, combos, chunksize=chunksize))
+    seconds = time.monotonic() - start
+    print(f"  Done in {seconds:.1f}s ({len(combos) / seconds:,.0f} combinations/s)")
+
+    results.sort(key=rank_key)
+    with open(RESULTS_FILE, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=RESULT_FIELDS)
+        writer.writeheader()
+        writer.writerows(results)
+
+    print(f"\nTop {args.top} combinations (hit rate, then fewest false positives, then lead time):")
+    columns = list(SWEEP_GRID)
+    print("  ".join(f"{name.replace('weight_', 'w_'):>10}" for name in columns) + "   hits   lead    FP")
+    for result in results[:args.top]:
+        lead = f"{result['avg_lead_months']:.1f}" if result["avg_lead_months"] is not None else "-"
+        print("  ".join(f"{result[name]:>10}" for name in columns)
+              + f"   {result['hits']}/{result['recessions']}  {lead:>5} {result['false_positives']:>5}")
+
+    _init_worker(INPUTS_FILE, windows)
+    print(f"\nCurrent model (alarm 70): {json.dumps(evaluate_combo(DEFAULT_COMBO))}")
+    print(f"Results saved to: {RESULTS_FILE}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
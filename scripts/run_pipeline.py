@@ -0,0 +1,370 @@
+"""
+Data Pipeline Runner
+Run: python run_pipeline.py [--workers 4] [--timeout 1800] [--only JOB ...] [--no-cache] [--force]
+                            [--record | --replay]
+
+Every fetcher is a job with declared input and output data files. A job depends
+on the jobs producing its inputs: independent fetchers run in parallel, and
+derived jobs (yield curve, credit spreads) only run when every upstream job
+succeeded, instead of silently reading stale files. A derived job whose inputs
+still match the hashes recorded in its outputs (build_cache.py) is not started
+at all and counts as "cached" for its dependents. The manifest is built last.
+Writes a per-job report (status, timing, outputs written) to .cache/pipeline/report.json
+--record saves every upstream response as a fixture and --replay runs the jobs
+offline from those fixtures (fixtures.py)
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+import build_cache
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(SCRIPT_DIR, "..", "data")
+PIPELINE_DIR = os.path.join(SCRIPT_DIR, "..", ".cache", "pipeline")
+LOG_DIR = os.path.join(PIPELINE_DIR, "logs")
+REPORT_FILE = os.path.join(PIPELINE_DIR, "report.json")
+
+DEFAULT_WORKERS = 4
+DEFAULT_TIMEOUT = 1800  # seconds per job
+POLL_INTERVAL = 0.2
+
+# Statuses that let dependent jobs run
+SUCCESS = ("ok", "cached")
+
+# Jobs in declaration order; inputs/outputs are file names in data/
+# after_all: run once every other job has finished, whatever its status
+JOBS = [
+    {
+        "name": "imf",
+        "script": "fetch_imf_all.py",
+        "inputs": [],
+        "outputs": ["imf_debt_data.json", "gdp_data.json", "debt_data.json", "employment_data.json"]
+    },
+    {"name": "m2", "script": "fetch_m2_data.py", "inputs": [], "outputs": ["m2_data.json"]},
+    {"name": "trade", "script": "fetch_trade_data.py", "inputs": [], "outputs": ["trade_data.json"]},
+    {"name": "bonds", "script": "fetch_bonds_data.py", "inputs": [], "outputs": ["bonds_data.json"]},
+    {
+        "name": "corporate_bonds",
+        "script": "fetch_corporate_bonds_data.py",
+        "inputs": [],
+        "outputs": ["corporate_bonds_data.json"]
+    },
+    {
+        "name": "yield_curve",
+        "script": "fetch_yield_curve.py",
+        "inputs": ["bonds_data.json"],
+        "outputs": ["yield_curve_data.json"]
+    },
+    {"name": "pmi", "script": "fetch_pmi_data.py", "inputs": [], "outputs": ["pmi_data.json"]},
+    {
+        "name": "credit_spreads",
+        "script": "fetch_credit_spreads.py",
+        "inputs": ["bonds_data.json", "corporate_bonds_data.json"],
+        "outputs": ["credit_spreads_data.json"]
+    },
+    {
+        "name": "unemployment_claims",
+        "script": "fetch_unemployment_claims.py",
+        "inputs": [],
+        "outputs": ["unemployment_claims_data.json"]
+    },
+    {
+        "name": "consumer_confidence",
+        "script": "fetch_consumer_confidence.py",
+        "inputs": [],
+        "outputs": ["consumer_confidence_data.json"]
+    },
+    {"name": "big_mac", "script": "fetch_big_mac_index.py", "inputs": [], "outputs": ["big_mac_index_data.json"]},
+    {
+        "name": "gold_heatmap",
+        "script": "fetch_gold_heatmap_data.py",
+        "inputs": [],
+        "outputs": ["gold_heatmap_data.json", "gold_heatmap_history.json"]
+    },
+    {
+        "name": "manifest",
+        "script": "build_manifest.py",
+        "inputs": [],
+        "outputs": ["manifest.json"],
+        "after_all": True
+    }
+]
+
+
+def dependencies(jobs):
+    """
+    Job name -> names of the jobs producing its inputs
+    Inputs no selected job produces are read from data/ as they are
+    Raises ValueError on duplicate outputs or a dependency cycle
+    """
+    producers = {}
+    for job in jobs:
+        for output in job["outputs"]:
+            if output in producers:
+                raise ValueError(f"{output} is produced by both {producers[output]} and {job['name']}")
+            producers[output] = job["name"]
+
+    deps = {job["name"]: sorted({producers[i] for i in job["inputs"] if i in producers}) for job in jobs}
+
+    # Depth-first cycle check
+    state = {}
+
+    def visit(name, path):
+        if state.get(name) == "done":
+            return
+        if state.get(name) == "visiting":
+            raise ValueError(f"Dependency cycle: {' -> '.join(path + [name])}")
+        state[name] = "visiting"
+        for dep in deps[name]:
+            visit(dep, path + [name])
+        state[name] = "done"
+
+    for name in deps:
+        visit(name, [])
+    return deps
+
+
+def output_mtimes(job):
+    mtimes = {}
+    for output in job["outputs"]:
+        path = os.path.join(DATA_DIR, output)
+        mtimes[output] = os.path.getmtime(path) if os.path.exists(path) else None
+    return mtimes
+
+
+def is_cached(job):
+    """True when every output of a derived job was built from its current inputs"""
+    if not job["inputs"]:
+        return False
+    hashes = build_cache.input_hashes(
+        [os.path.join(DATA_DIR, name) for name in job["inputs"]],
+        os.path.join(SCRIPT_DIR, job["script"])
+    )
+    return all(build_cache.is_up_to_date(os.path.join(DATA_DIR, output), hashes)
+               for output in job["outputs"])
+
+
+def start_job(job, extra_args):
+    """Launch a job's script with its output going to a log file"""
+    os.makedirs(LOG_DIR, exist_ok=True)
+    log_path = os.path.join(LOG_DIR, f"{job['name']}.log")
+    log = open(log_path, "w", encoding="utf-8")
+    process = subprocess.Popen(
+        [sys.executable, job["script"], *extra_args],
+        cwd=SCRIPT_DIR,
+        stdout=log,
+        stderr=subprocess.STDOUT,
+        env={**os.environ, "PYTHONUNBUFFERED": "1"}
+    )
+    return {
+        "process": process,
+        "log": log,
+        "log_path": log_path,
+        "started": time.monotonic(),
+        "mtimes": output_mtimes(job)
+    }
+
+
+def print_job_log(name, log_path):
+    """Replay a finished job's output, folded into a group on GitHub Actions"""
+    in_actions = os.environ.get("GITHUB_ACTIONS") == "true"
+    print(f"::group::{name}" if in_actions else f"\n{'-' * 30} {name} {'-' * 30}")
+    with open(log_path, "r", encoding="utf-8", errors="replace") as f:
+        print(f.read().rstrip())
+    if in_actions:
+        print("::endgroup::")
+
+
+def run_jobs(jobs, workers=DEFAULT_WORKERS, timeout=DEFAULT_TIMEOUT, extra_args=()):
+    """Run the job graph; returns one result dict per job, in declaration order"""
+    deps = dependencies(jobs)
+    by_name = {job["name"]: job for job in jobs}
+    pending = [job["name"] for job in jobs]
+    running = {}
+    results = {}
+    pipeline_start = time.monotonic()
+
+    while pending or running:
+        for name in list(pending):
+            if len(running) >= workers:
+                break
+            job = by_name[name]
+
+            if job.get("after_all") and (running or any(not by_name[p].get("after_all") for p in pending if p != name)):
+                continue
+            if any(dep not in results for dep in deps[name]):
+                continue
+
+            pending.remove(name)
+            failed = [dep for dep in deps[name] if results[dep]["status"] not in SUCCESS]
+            if failed:
+                results[name] = {
+                    "name": name,
+                    "script": job["script"],
+                    "status": "skipped",
+                    "reason": f"upstream failed: {', '.join(failed)}",
+                    "exit_code": None,
+                    "started_at": None,
+                    "seconds": 0.0,
+                    "outputs_written": []
+                }
+                print(f"- {name} skipped ({results[name]['reason']})")
+                continue
+
+            if is_cached(job):
+                results[name] = {
+                    "name": name,
+                    "script": job["script"],
+                    "status": "cached",
+                    "reason": "inputs unchanged",
+                    "exit_code": None,
+                    "started_at": None,
+                    "seconds": 0.0,
+                    "outputs_written": []
+                }
+                print(f"= {name} cached (inputs unchanged)")
+                continue
+
+            print(f"> {name} started ({job['script']})")
+            running[name] = start_job(job, extra_args)
+
+        time.sleep(POLL_INTERVAL)
+
+        for name, state in list(running.items()):
+            process = state["process"]
+            elapsed = time.monotonic() - state["started"]
+
+            if process.poll() is None:
+                if elapsed <= timeout:
+                    continue
+                process.terminate()
+                try:
+                    process.wait(timeout=10)
+                except subprocess.TimeoutExpired:
+                    process.kill()
+                    process.wait()
+                status = "timeout"
+            else:
+                status = "ok" if process.returncode == 0 else "failed"
+
+            state["log"].close()
+            del running[name]
+
+            before = state["mtimes"]
+            after = output_mtimes(by_name[name])
+            results[name] = {
+                "name": name,
+                "script": by_name[name]["script"],
+                "status": status,
+                "reason": None,
+                "exit_code": process.returncode,
+                "started_at": round(state["started"] - pipeline_start, 1),
+                "seconds": round(elapsed, 1),
+                "outputs_written": [o for o in after if after[o] is not None and after[o] != before[o]]
+            }
+            print_job_log(name, state["log_path"])
+            marker = "✓" if status == "ok" else "✗"
+            print(f"{marker} {name} {status} in {elapsed:.1f}s")
+
+    return [results[job["name"]] for job in jobs]
+
+
+def print_report(results, total_seconds):
+    print(f"\n{'=' * 80}")
+    print(f"PIPELINE REPORT")
+    print(f"{'=' * 80}")
+    print(f"{'Job':<22} {'Status':<8} {'Start (s)':>9} {'Time (s)':>9}  Outputs written")
+    print("-" * 80)
+    for result in results:
+        start = f"{result['started_at']:.1f}" if result["started_at"] is not None else "-"
+        written = ", ".join(result["outputs_written"]) or (result["reason"] or "-")
+        print(f"{result['name']:<22} {result['status']:<8} {start:>9} {result['seconds']:>9.1f}  {written}")
+    print("-" * 80)
+    ok = sum(r["status"] in SUCCESS for r in results)
+    print(f"{ok}/{len(results)} jobs succeeded in {total_seconds:.1f}s")
+
+
+def write_step_summary(results, total_seconds):
+    """Markdown report on the GitHub Actions run page, when running there"""
+    summary_path = os.environ.get("GITHUB_STEP_SUMMARY")
+    if not summary_path:
+        return
+    lines = [
+        "## Data pipeline",
+        "",
+        "| Job | Status | Start (s) | Time (s) | Outputs written |",
+        "| --- | --- | ---: | ---: | --- |"
+    ]
+    for r in results:
+        start = f"{r['started_at']:.1f}" if r["started_at"] is not None else "-"
+        written = ", ".join(r["outputs_written"]) or (r["reason"] or "-")
+        lines.append(f"| {r['name']} | {r['status']} | {start} | {r['seconds']:.1f} | {written} |")
+    lines.append("")
+    lines.append(f"Total: {total_seconds:.1f}s")
+    with open(summary_path, "a", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+def main():
+    names = [job["name"] for job in JOBS]
+    parser = argparse.ArgumentParser(description="Run the data fetchers as a dependency graph")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help=f"Jobs run in parallel (default {DEFAULT_WORKERS})")
+    parser.add_argument("--timeout", type=int, default=DEFAULT_TIMEOUT,
+                        help=f"Seconds before a job is terminated (default {DEFAULT_TIMEOUT})")
+    parser.add_argument("--only", nargs="+", choices=names, metavar="JOB",
+                        help=f"Subset of jobs to run ({', '.join(names)}); other inputs are read from data/")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Pass --no-cache to every job (bypass the HTTP cache)")
+    parser.add_argument("--force", action="store_true",
+                        help="Rebuild derived jobs even when their inputs are unchanged")
+    fixture_mode = parser.add_mutually_exclusive_group()
+    fixture_mode.add_argument("--record", action="store_true",
+                              help="Save every upstream response as a fixture (FIXTURES=record)")
+    fixture_mode.add_argument("--replay", action="store_true",
+                              help="Serve upstream responses from recorded fixtures, offline (FIXTURES=replay)")
+    args = parser.parse_args()
+
+    jobs = [job for job in JOBS if not args.only or job["name"] in args.only]
+    extra_args = (["--no-cache"] if args.no_cache else []) + (["--force"] if args.force else [])
+    # Shared by every job of this run (imf_loader reuses downloads within a run only)
+    os.environ["PIPELINE_RUN_ID"] = f"{datetime.now():%Y%m%dT%H%M%S}-{os.getpid()}"
+    if args.record or args.replay:
+        # Inherited by every job's process
+        os.environ["FIXTURES"] = "record" if args.record else "replay"
+
+    print("=" * 80)
+    print("DATA PIPELINE")
+    print("=" * 80)
+    print(f"Jobs: {', '.join(job['name'] for job in jobs)} ({max(1, args.workers)} workers)")
+    if os.environ.get("FIXTURES"):
+        print(f"Fixtures: {os.environ['FIXTURES']}")
+
+    started_at = datetime.now().isoformat()
+    start = time.monotonic()
+    results = run_jobs(jobs, workers=max(1, args.workers), timeout=args.timeout, extra_args=extra_args)
+    total_seconds = time.monotonic() - start
+
+    print_report(results, total_seconds)
+    write_step_summary(results, total_seconds)
+
+    os.makedirs(PIPELINE_DIR, exist_ok=True)
+    with open(REPORT_FILE, "w", encoding="utf-8") as f:
+        json.dump({
+            "started_at": started_at,
+            "seconds": round(total_seconds, 1),
+            "jobs": results
+        }, f, indent=2)
+    print(f"Report saved to: {REPORT_FILE}")
+
+    return 0 if all(r["status"] in SUCCESS for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+"""
+Per-year and per-country shards of a country metric file
+data/gdp_data.json is split into:
+  data/gdp_data.index.json           metadata, regions, country list, shard hashes
+  data/gdp_data/years/<year>.json    that year's ranking ({year, data: [rows]})
+  data/gdp_data/countries/<code>.json  that country's timeseries entry
+MetricPage loads the index first, then only the year and countries on screen;
+each shard is requested with its hash from the index as ?v= version
+"""
+
+import glob
+import os
+
+import compact_json
+
+
+def index_path(output_file):
+    return f"{os.path.splitext(output_file)[0]}.index.json"
+
+
+def shard_dir(output_file):
+    return os.path.splitext(output_file)[0]
+
+
+def write_group(directory, shards):
+    """Write {name: payload} as directory/<name>.json, drop stale shards, return {name: hash}"""
+    os.makedirs(directory, exist_ok=True)
+    hashes = {}
+    for name, payload in shards.items():
+        path = os.path.join(directory, f"{name}.json")
+        compact_json.write_json(payload, path, compress=False, verbose=False)
+        hashes[name] = compact_json.file_hash(path)
+
+    for path in glob.glob(os.path.join(directory, "*.json")):
+        if os.path.splitext(os.path.basename(path))[0] not in shards:
+            os.remove(path)
+    return hashes
+
+
+def write_shards(result, output_file):
+    """Write the index and shards of a {metadata, data, timeseries} metric"""
+    data = result["data"]
+    timeseries = result["timeseries"]
+    directory = shard_dir(output_file)
+
+    year_hashes = write_group(os.path.join(directory, "years"), {
+        year: {"year": year, "data": rows}
+        for year, rows in data.items()
+    })
+    country_hashes = write_group(os.path.join(directory, "countries"), {
+        code: {"code": code, **entry}
+        for code, entry in timeseries.items()
+    })
+
+    index = {
+        "metadata": result["metadata"],
+        "regions": sorted({row["region"] for rows in data.values() for row in rows}),
+        "countries": [
+            {"code": code, "country": entry["country"], "region": entry["region"]}
+            for code, entry in timeseries.items()
+        ],
+        "timeseries_years": sorted({point["year"] for entry in timeseries.values() for point in entry["data"]}),
+        "rows": {year: len(rows) for year, rows in data.items()},
+        "shards": {
+            "years": year_hashes,
+            "countries": country_hashes
+        }
+    }
+    compact_json.write_json(index, index_path(output_file))
+    print(f"Shards saved to: {directory} ({len(year_hashes)} years, {len(country_hashes)} countries)")
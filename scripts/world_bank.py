@@ -0,0 +1,153 @@
+"""
+World Bank indicator reader
+Follows the API's `pages` metadata instead of asking for one huge page: page 1
+is fetched first, the remaining pages concurrently, and every page's records
+are folded straight into a compact (country, year) -> value matrix as soon as
+it arrives. Only countries in COUNTRY_NAMES get a row; derived metrics
+(M2 = pct * GDP, exports - imports) are then plain numpy array operations
+"""
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import numpy as np
+
+import http_client
+from country_mappings import COUNTRY_NAMES, REGIONS, ISO3_TO_ISO2
+
+WB_API_BASE = "https://api.worldbank.org/v2"
+WB_PER_PAGE = 1000
+WB_WORKERS = 4
+WB_TIMEOUT = 60
+
+
+def indicator_url(indicator, start_year, end_year, page=1):
+    return (f"{WB_API_BASE}/country/all/indicator/{indicator}"
+            f"?format=json&per_page={WB_PER_PAGE}&date={start_year}:{end_year}&page={page}")
+
+
+class IndicatorMatrix:
+    """
+    Values of several indicators on a shared country x year grid (NaN = missing)
+    countries: ISO3 codes (rows, COUNTRY_NAMES order)
+    years: year strings (columns, ascending)
+    values: indicator -> 2D float array
+    reported_years: indicator -> years with at least one value (any economy,
+                    aggregates included)
+    urls: every page URL fetched, for http_client.skip_if_unchanged
+    """
+
+    def __init__(self, start_year, end_year):
+        self.start_year = start_year
+        self.years = [str(y) for y in range(start_year, end_year + 1)]
+        self.countries = [code for code in COUNTRY_NAMES if code in ISO3_TO_ISO2]
+        self._rows = {ISO3_TO_ISO2[code]: i for i, code in enumerate(self.countries)}
+        self.values = {}
+        self.reported_years = {}
+        self.urls = []
+
+    def add_indicator(self, indicator):
+        self.values[indicator] = np.full((len(self.countries), len(self.years)), np.nan)
+        self.reported_years[indicator] = set()
+
+    def fold(self, indicator, records):
+        """Write one page of API records into the indicator's grid"""
+        grid = self.values[indicator]
+        reported = self.reported_years[indicator]
+        for item in records or []:
+            year = item.get("date")
+            value = item.get("value")
+            if not year or value is None:
+                continue
+            reported.add(year)
+            row = self._rows.get((item.get("country") or {}).get("id"))
+            if row is None or not year.isdigit():
+                continue
+            col = int(year) - self.start_year
+            if 0 <= col < len(self.years):
+                grid[row, col] = float(value)
+
+
+def _get_page(url, description):
+    payload = http_client.get_json(url, timeout=WB_TIMEOUT, description=description)
+    if not isinstance(payload, list) or len(payload) < 2:
+        raise ValueError(f"No data found for {description}")
+    return payload[0], payload[1]
+
+
+def fetch_indicators(indicators, start_year, end_year, max_workers=WB_WORKERS):
+    """Download every page of each indicator into one IndicatorMatrix"""
+    matrix = IndicatorMatrix(start_year, end_year)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # Page 1 of every indicator tells us how many pages follow
+        first_pages = {}
+        for indicator in indicators:
+            matrix.add_indicator(indicator)
+            url = indicator_url(indicator, start_year, end_year)
+            matrix.urls.append(url)
+            first_pages[executor.submit(_get_page, url, f"{indicator} page 1")] = indicator
+
+        rest = {}
+        for future in as_completed(first_pages):
+            indicator = first_pages[future]
+            meta, records = future.result()
+            pages = int(meta.get("pages") or 1)
+            print(f"  {indicator}: {meta.get('total', '?')} records in {pages} pages")
+            matrix.fold(indicator, records)
+
+            for page in range(2, pages + 1):
+                url = indicator_url(indicator, start_year, end_year, page)
+                matrix.urls.append(url)
+                rest[executor.submit(_get_page, url, f"{indicator} page {page}")] = indicator
+
+        for future in as_completed(rest):
+            _, records = future.result()
+            matrix.fold(rest[future], records)
+
+    return matrix
+
+
+def build_views(matrix, years, columns, region_default="Other"):
+    """
+    Per-year rankings and per-country timeseries from derived value grids
+    columns: output field -> 2D array shaped like the matrix, "value" first;
+    a (country, year) cell is kept only when every column has a value there
+    Returns (data, timeseries) in the layout the frontend reads
+    """
+    index = {year: i for i, year in enumerate(matrix.years)}
+    cols = [index[year] for year in years]
+    fields = list(columns)
+    grid = np.stack([columns[field][:, cols] for field in fields])
+    valid = ~np.isnan(grid).any(axis=0)
+
+    data = {}
+    for j, year in enumerate(years):
+        rows = np.flatnonzero(valid[:, j])
+        rows = rows[np.argsort(-grid[0, rows, j], kind="stable")]
+        data[year] = []
+        for i in rows:
+            code = matrix.countries[i]
+            entry = {"code": code, "country": COUNTRY_NAMES[code]}
+            entry.update({field: float(grid[k, i, j]) for k, field in enumerate(fields)})
+            entry["region"] = REGIONS.get(code, region_default)
+            entry["isProjection"] = False
+            data[year].append(entry)
+
+    timeseries = {}
+    ascending = sorted(range(len(years)), key=lambda j: years[j])
+    for i in np.flatnonzero(valid.any(axis=1)):
+        code = matrix.countries[i]
+        series = []
+        for j in ascending:
+            if valid[i, j]:
+                point = {"year": years[j]}
+                point.update({field: float(grid[k, i, j]) for k, field in enumerate(fields)})
+                point["isProjection"] = False
+                series.append(point)
+        timeseries[code] = {
+            "country": COUNTRY_NAMES[code],
+            "region": REGIONS.get(code, region_default),
+            "data": series
+        }
+
+    return data, timeseries
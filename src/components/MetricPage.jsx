@@ -1,7 +1,7 @@
 import { useState, useEffect, useRef, useMemo, useCallback } from 'react';
 import { Chart, registerables } from 'chart.js';
 import { useTheme } from '../hooks/useTheme';
-import { useChartData } from '../hooks/useChartData';
+import { useMetricShards } from '../hooks/useChartData';
 import {
   regionColors,
   lineColors,
@@ -32,41 +32,31 @@ export default function MetricPage({
   formatFn = formatNumber
 }) {
   const { isDark } = useTheme();
-  const { data, loading, error } = useChartData(dataFile);
 
   const [view, setView] = useState('bar');
-  const [currentYear, setCurrentYear] = useState('2024');
+  const [selectedYear, setCurrentYear] = useState(null);
   const [currentRegion, setCurrentRegion] = useState('all');
   const [currentSort, setCurrentSort] = useState('value');
   const [selectedCountries, setSelectedCountries] = useState(new Set(['USA', 'CHN', 'JPN', 'DEU', 'ESP', 'FRA', 'GBR', 'ITA']));
   const [lineRegionFilter, setLineRegionFilter] = useState('all');
 
+  // Index first, then only the shown year's ranking and the selected countries' series
+  const { index: data, years: yearRows, timeseries, loading, error } =
+    useMetricShards(dataFile, selectedYear, selectedCountries);
+  const currentYear = selectedYear ?? data?.metadata?.last_real_year ?? '2024';
+
   const barChartRef = useRef(null);
   const lineChartRef = useRef(null);
   const barChartInstance = useRef(null);
   const lineChartInstance = useRef(null);
 
-  // Initialize year when data loads
-  useEffect(() => {
-    if (data?.metadata?.last_real_year) {
-      setCurrentYear(data.metadata.last_real_year);
-    }
-  }, [data]);
-
-  // Get unique regions from data
-  const regions = useMemo(() => {
-    if (!data?.data) return [];
-    const allRegions = new Set();
-    Object.values(data.data).forEach(items => {
-      items.forEach(item => allRegions.add(item.region));
-    });
-    return Array.from(allRegions).sort();
-  }, [data]);
+  // Unique regions across all years (precomputed in the index)
+  const regions = useMemo(() => data?.regions || [], [data]);
 
   // Filter and sort bar data
   const barData = useMemo(() => {
-    if (!data?.data?.[currentYear]) return [];
-    let items = data.data[currentYear];
+    if (!yearRows[currentYear]) return [];
+    let items = yearRows[currentYear];
 
     if (currentRegion !== 'all') {
       items = items.filter(d => d.region === currentRegion);
@@ -79,13 +69,12 @@ export default function MetricPage({
     }
 
     return items;
-  }, [data, currentYear, currentRegion, currentSort, valueKey]);
+  }, [yearRows, currentYear, currentRegion, currentSort, valueKey]);
 
   // Get countries for line chart selector
   const countries = useMemo(() => {
-    if (!data?.timeseries) return [];
-    let list = Object.entries(data.timeseries)
-      .map(([code, info]) => ({ code, ...info }))
+    if (!data?.countries) return [];
+    let list = [...data.countries]
       .sort((a, b) => a.country.localeCompare(b.country));
 
     if (lineRegionFilter !== 'all') {
@@ -209,21 +198,18 @@ export default function MetricPage({
 
   // Line chart effect
   useEffect(() => {
-    if (view !== 'line' || !lineChartRef.current || !data?.timeseries) return;
+    if (view !== 'line' || !lineChartRef.current || !data?.timeseries_years) return;
 
     const colors = getThemeColors(isDark);
     const projectionYears = new Set(data.metadata?.projection_years || []);
 
-    const allYears = [...new Set(
-      Object.values(data.timeseries)
-        .flatMap(c => c.data.map(d => d.year))
-    )].sort();
+    const allYears = data.timeseries_years;
 
     const datasets = [];
     let colorIndex = 0;
 
     selectedCountries.forEach(code => {
-      const countryData = data.timeseries[code];
+      const countryData = timeseries[code];
       if (!countryData) return;
 
       const color = lineColors[colorIndex % lineColors.length];
@@ -359,7 +345,7 @@ export default function MetricPage({
       options,
       plugins
     });
-  }, [view, selectedCountries, data, isDark, valueKey, valueUnit, formatFn, refLines]);
+  }, [view, selectedCountries, data, timeseries, isDark, valueKey, valueUnit, formatFn, refLines]);
 
   // Cleanup on unmount
   useEffect(() => {
@@ -1,5 +1,135 @@
 import { useState, useEffect } from 'react';
 
+const COMPACT_FORMAT = 'columnar-v1';
+const COLUMNS_KEY = '$columns';
+
+// Expand {"$columns": {key: [...]}} tables back into arrays of records
+function decodeTables(value) {
+  if (Array.isArray(value)) return value.map(decodeTables);
+  if (!value || typeof value !== 'object') return value;
+
+  const keys = Object.keys(value);
+  if (keys.length === 1 && keys[0] === COLUMNS_KEY) {
+    const columns = value[COLUMNS_KEY];
+    const names = Object.keys(columns);
+    const length = names.length ? columns[names[0]].length : 0;
+    const rows = new Array(length);
+    for (let i = 0; i < length; i++) {
+      const row = {};
+      for (const name of names) row[name] = columns[name][i];
+      rows[i] = row;
+    }
+    return rows;
+  }
+
+  const decoded = {};
+  for (const key of keys) decoded[key] = decodeTables(value[key]);
+  return decoded;
+}
+
+// Rebuild {metadata, data: {year: [rows]}, timeseries: {code: ...}} from the
+// columnar country format written by scripts/compact_json.py
+function decodeCountryMetric(compact) {
+  const { countries, fields, years, rows, values, projection } = compact;
+  const data = {};
+  const rebuilt = {};
+
+  years.forEach((year, j) => {
+    const isProjection = projection[j] === '1';
+    data[year] = rows[j].map((i, position) => {
+      const row = { code: countries.code[i], country: countries.country[i] };
+      for (const field of fields) row[field] = values[field][j][position];
+      row.region = countries.region[i];
+      row.isProjection = isProjection;
+      return row;
+    });
+  });
+
+  const ascending = years.map((_, j) => j).sort((a, b) => (years[a] < years[b] ? -1 : years[a] > years[b] ? 1 : 0));
+  for (const j of ascending) {
+    const isProjection = projection[j] === '1';
+    rows[j].forEach((i, position) => {
+      if (!rebuilt[i]) {
+        rebuilt[i] = { country: countries.country[i], region: countries.region[i], data: [] };
+      }
+      const point = { year: years[j] };
+      for (const field of fields) point[field] = values[field][j][position];
+      point.isProjection = isProjection;
+      rebuilt[i].data.push(point);
+    });
+  }
+
+  const timeseries = {};
+  for (const item of compact.series) {
+    if (typeof item === 'string') timeseries[item] = compact.timeseries[item];
+    else timeseries[countries.code[item]] = rebuilt[item];
+  }
+
+  return { metadata: compact.metadata, data, timeseries };
+}
+
+export function decodeCompact(json) {
+  if (json && json.format === COMPACT_FORMAT) return decodeCountryMetric(json);
+  return decodeTables(json);
+}
+
+const MANIFEST_FILE = 'manifest.json';
+let manifestPromise = null;
+const shardCache = new Map();
+
+function fileName(dataFile) {
+  return dataFile.slice(dataFile.lastIndexOf('/') + 1);
+}
+
+async function fetchJson(url) {
+  const res = await fetch(url);
+  if (!res.ok) throw new Error('Data file not found');
+  return res.json();
+}
+
+// data/manifest.json (scripts/build_manifest.py) maps each data file to a
+// content hash. It is revalidated once per page load; the data files themselves
+// are requested as file?v=<hash>, so a cached copy is reused until it changes.
+function loadManifest(dataFile) {
+  if (!manifestPromise) {
+    const dir = dataFile.slice(0, dataFile.lastIndexOf('/') + 1);
+    manifestPromise = fetch(`${dir}${MANIFEST_FILE}`, { cache: 'no-cache' })
+      .then(res => (res.ok ? res.json() : null))
+      .catch(() => null);
+  }
+  return manifestPromise;
+}
+
+// Load a data file through its precompressed .gz sibling, inflating it with
+// DecompressionStream while it downloads. Falls back to the plain file when the
+// browser lacks DecompressionStream or the sibling is missing or unreadable
+// (e.g. a server that already decoded it via Content-Encoding).
+// The .br siblings are for hosts that negotiate Content-Encoding themselves:
+// DecompressionStream has no brotli format.
+// Pass { version, gzip } to skip the manifest lookup (used for shards).
+export async function loadDataFile(dataFile, { version, gzip } = {}) {
+  if (version === undefined) {
+    const manifest = await loadManifest(dataFile);
+    const entry = manifest?.files?.[fileName(dataFile)];
+    version = entry?.hash;
+    gzip = entry ? entry.gzip_size != null : true;
+  }
+  const query = version ? `?v=${version}` : '';
+
+  if (gzip && typeof DecompressionStream !== 'undefined') {
+    try {
+      const res = await fetch(`${dataFile}.gz${query}`);
+      if (res.ok && res.body) {
+        const stream = res.body.pipeThrough(new DecompressionStream('gzip'));
+        return await new Response(stream).json();
+      }
+    } catch {
+      // Use the uncompressed file below
+    }
+  }
+  return fetchJson(`${dataFile}${query}`);
+}
+
 export function useChartData(dataFile) {
   const [data, setData] = useState(null);
   const [loading, setLoading] = useState(true);
@@ -9,13 +139,9 @@ export function useChartData(dataFile) {
     setLoading(true);
     setError(null);
 
-    fetch(dataFile)
-      .then(res => {
-        if (!res.ok) throw new Error('Data file not found');
-        return res.json();
-      })
+    loadDataFile(dataFile)
       .then(jsonData => {
-        setData(jsonData);
+        setData(decodeCompact(jsonData));
         setLoading(false);
       })
       .catch(err => {
@@ -26,3 +152,131 @@ export function useChartData(dataFile) {
 
   return { data, loading, error };
 }
+
+// Index built in memory from a full metric file, for datasets without shards
+function indexFromFull(full) {
+  const regions = new Set();
+  Object.values(full.data).forEach(rows => rows.forEach(row => regions.add(row.region)));
+  const years = new Set();
+  Object.values(full.timeseries).forEach(entry => entry.data.forEach(point => years.add(point.year)));
+
+  return {
+    metadata: full.metadata,
+    regions: [...regions].sort(),
+    countries: Object.entries(full.timeseries).map(([code, entry]) => ({ code, country: entry.country, region: entry.region })),
+    timeseries_years: [...years].sort(),
+    shards: {
+      years: Object.fromEntries(Object.keys(full.data).map(year => [year, null])),
+      countries: Object.fromEntries(Object.keys(full.timeseries).map(code => [code, null]))
+    },
+    local: full
+  };
+}
+
+// data/x.index.json (scripts/shards.py), or the full data/x.json when the
+// dataset has no shards
+async function loadMetricIndex(dataFile) {
+  const indexFile = dataFile.replace(/\.json$/, '.index.json');
+  const manifest = await loadManifest(dataFile);
+  if (!manifest || manifest.files?.[fileName(indexFile)]) {
+    try {
+      return decodeCompact(await loadDataFile(indexFile));
+    } catch {
+      // No shards for this dataset: load the full file below
+    }
+  }
+  return indexFromFull(decodeCompact(await loadDataFile(dataFile)));
+}
+
+// One year's ranking ({year, data}) or one country's timeseries ({code, country, region, data})
+function loadShard(dataFile, index, group, name) {
+  if (index.local) {
+    return Promise.resolve(group === 'years'
+      ? { year: name, data: index.local.data[name] }
+      : { code: name, ...index.local.timeseries[name] });
+  }
+
+  const url = `${dataFile.replace(/\.json$/, '')}/${group}/${name}.json`;
+  const version = index.shards[group][name];
+  const key = `${url}?v=${version}`;
+  if (!shardCache.has(key)) {
+    const promise = loadDataFile(url, { version, gzip: false }).then(decodeCompact);
+    promise.catch(() => shardCache.delete(key));
+    shardCache.set(key, promise);
+  }
+  return shardCache.get(key);
+}
+
+// Lazily loaded country metric: the index first, then only the shown year's
+// ranking and the selected countries' timeseries. `year` defaults to the
+// index's last_real_year.
+export function useMetricShards(dataFile, year, codes) {
+  const [index, setIndex] = useState(null);
+  const [years, setYears] = useState({});
+  const [timeseries, setTimeseries] = useState({});
+  const [loading, setLoading] = useState(true);
+  const [error, setError] = useState(null);
+
+  useEffect(() => {
+    let cancelled = false;
+    setLoading(true);
+    setError(null);
+    setIndex(null);
+    setYears({});
+    setTimeseries({});
+
+    loadMetricIndex(dataFile)
+      .then(loaded => {
+        if (cancelled) return;
+        setIndex(loaded);
+        setLoading(false);
+      })
+      .catch(err => {
+        if (cancelled) return;
+        setError(err.message);
+        setLoading(false);
+      });
+
+    return () => { cancelled = true; };
+  }, [dataFile]);
+
+  useEffect(() => {
+    const target = year ?? index?.metadata?.last_real_year;
+    if (!index || !target || !(target in index.shards.years)) return;
+    let cancelled = false;
+
+    loadShard(dataFile, index, 'years', target)
+      .then(shard => {
+        if (!cancelled) setYears(prev => ({ ...prev, [target]: shard.data }));
+      })
+      .catch(err => {
+        if (!cancelled) setError(err.message);
+      });
+
+    return () => { cancelled = true; };
+  }, [dataFile, index, year]);
+
+  useEffect(() => {
+    if (!index) return;
+    const missing = [...codes].filter(code => !timeseries[code] && code in index.shards.countries);
+    if (missing.length === 0) return;
+    let cancelled = false;
+
+    Promise.all(missing.map(code => loadShard(dataFile, index, 'countries', code)))
+      .then(shards => {
+        if (cancelled) return;
+        setTimeseries(prev => {
+          const next = { ...prev };
+          shards.forEach(({ code, ...entry }) => { next[code] = entry; });
+          return next;
+        });
+      })
+      .catch(err => {
+        if (!cancelled) setError(err.message);
+      });
+
+    return () => { cancelled = true; };
+  }, [dataFile, index, codes, timeseries]);
+
+  return { index, years, timeseries, loading, error };
+}
@@ -675,7 +675,7 @@ export default function RecessionIndicators() {
             Consumer Confidence of 55, Unemployment of 30, and Big Mac of 25:
           </p>
           <p className="text-xs font-mono text-gray-600 dark:text-gray-400">
-            Risk = (60×0.30) + (75×0.20) + (40×0.15) + (55×0.15) + (30×0.10) + (25×0.10) = <strong className="text-blue-600 dark:text-blue-400">54.25</strong>
+            Risk = (60×0.30) + (75×0.20) + (40×0.15) + (55×0.15) + (30×0.10) + (25×0.10) = <strong className="text-blue-600 dark:text-blue-400">52.75</strong>
           </p>
         </div>
 
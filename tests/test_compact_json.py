@@ -0,0 +1,123 @@
+import copy
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+
+import compact_json
+
+COUNTRIES = [("USA", "United States", "North America"), ("DEU", "Germany", "Europe"), ("JPN", "Japan", "Asia")]
+
+
+def country_metric():
+    """A country metric in the legacy shape: per-year ranked rows, per-country series and a WLD aggregate"""
+    data = {}
+    timeseries = {}
+    for year, projection in (("2024", False), ("2023", False), ("2025", True)):
+        rows = []
+        for rank, (code, country, region) in enumerate(COUNTRIES):
+            value = round(1.5 * (rank + 1) + int(year) % 10 / 4, 2)
+            rows.append({"code": code, "country": country, "value": value, "region": region, "isProjection": projection})
+        data[year] = rows
+    for code, country, region in COUNTRIES:
+        points = []
+        for year in sorted(data):
+            row = next(row for row in data[year] if row["code"] == code)
+            points.append({"year": year, "value": row["value"], "isProjection": row["isProjection"]})
+        timeseries[code] = {"country": country, "region": region, "data": points}
+    # The world aggregate has no rows in `data`, so it can only be stored verbatim
+    timeseries["WLD"] = {
+        "country": "World",
+        "region": "World",
+        "data": [{"year": "2023", "value": 3.1, "isProjection": False},
+                 {"year": "2024", "value": 3.2, "isProjection": False}]
+    }
+    return {"metadata": {"source": "IMF", "fetched_at": "2026-01-01T00:00:00"}, "data": data, "timeseries": timeseries}
+
+
+def round_trip(result):
+    """decode(encode(result)) after a pass through JSON, as the file on disk would be read"""
+    encoded = json.loads(json.dumps(compact_json.encode(result)))
+    return encoded, compact_json.decode(encoded)
+
+
+def test_country_metric_round_trip():
+    result = country_metric()
+    encoded, decoded = round_trip(copy.deepcopy(result))
+    assert encoded["format"] == compact_json.COMPACT_FORMAT
+    assert encoded["years"] == ["2024", "2023", "2025"]
+    assert encoded["projection"] == "001"
+    # Country series are rebuilt from the rows; only WLD is kept verbatim
+    assert encoded["series"] == [0, 1, 2, "WLD"]
+    assert list(encoded["timeseries"]) == ["WLD"]
+    assert decoded == result
+    assert list(decoded["data"]) == list(result["data"])
+    assert list(decoded["timeseries"]) == list(result["timeseries"])
+
+
+def test_country_series_that_differs_from_rows_is_kept_verbatim():
+    result = country_metric()
+    result["timeseries"]["DEU"]["data"][0]["value"] = 99.0
+    encoded, decoded = round_trip(copy.deepcopy(result))
+    assert encoded["series"] == [0, "DEU", 2, "WLD"]
+    assert decoded == result
+
+
+def test_columns_table_round_trip():
+    result = {
+        "metadata": {"source": "CFTC"},
+        "reports": [
+            {"date": "2026-01-06", "long": 120, "short": 80.5, "note": None},
+            {"date": "2026-01-13", "long": 118, "short": 82.0, "note": "holiday"}
+        ],
+        "history": {"gold": [{"date": "2026-01-06", "close": 2650.1}, {"date": "2026-01-13", "close": 2671.4}]},
+        "single": [{"date": "2026-01-06", "close": 1.0}],
+        "nested": [{"date": "2026-01-06", "tags": ["a"]}, {"date": "2026-01-13", "tags": []}]
+    }
+    encoded, decoded = round_trip(copy.deepcopy(result))
+    assert encoded["reports"] == {compact_json.COLUMNS_KEY: {
+        "date": ["2026-01-06", "2026-01-13"], "long": [120, 118], "short": [80.5, 82.0], "note": [None, "holiday"]}}
+    assert compact_json.COLUMNS_KEY in encoded["history"]["gold"]
+    # One record, or records holding lists, stay as they are
+    assert encoded["single"] == result["single"]
+    assert encoded["nested"] == result["nested"]
+    assert decoded == result
+
+
+def mixed_projection(result):
+    result["data"]["2025"][0]["isProjection"] = False
+    return result
+
+
+def inconsistent_keys(result):
+    result["data"]["2023"][1] = {"code": "DEU", "country": "Germany", "value": 2.0, "exports": 1.0,
+                                 "region": "Europe", "isProjection": False}
+    return result
+
+
+def renamed_country(result):
+    result["data"]["2023"][0]["country"] = "USA"
+    return result
+
+
+@pytest.mark.parametrize("breaks_columnar", [mixed_projection, inconsistent_keys, renamed_country])
+def test_country_metric_that_does_not_fit_falls_back(breaks_columnar):
+    result = breaks_columnar(country_metric())
+    encoded, decoded = round_trip(copy.deepcopy(result))
+    assert "format" not in encoded
+    assert decoded == result
+
+
+def test_write_json_round_trip(tmp_path):
+    path = str(tmp_path / "metric.json")
+    result = country_metric()
+    assert compact_json.write_json(result, path, verbose=False)
+    assert compact_json.read_json(path) == result
+    assert os.path.exists(f"{path}.gz")
+
+    # Only fetched_at changed: the file is left alone
+    result["metadata"]["fetched_at"] = "2026-02-01T00:00:00"
+    assert not compact_json.write_json(result, path, verbose=False)
@@ -0,0 +1,47 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+
+import fred_store
+
+
+@pytest.fixture
+def series(monkeypatch):
+    """A monthly and a business-daily series served from memory"""
+    monthly = [f"2000-{month:02d}-01" for month in range(1, 13)]
+    daily = [str(day) for day in np.arange(np.datetime64("2000-01-03"), np.datetime64("2000-02-01"))
+             if np.is_busday(day)]
+    monkeypatch.setattr(fred_store, "_series", {
+        "MONTHLY": (monthly, [float(i) for i in range(len(monthly))]),
+        "DAILY": (daily, [float(i) for i in range(len(daily))])
+    })
+    monkeypatch.setattr(fred_store, "_max_ages", {})
+
+
+def test_as_of_never_uses_later_observations(series):
+    assert fred_store.as_of("MONTHLY", "2000-03-31") == ("2000-03-01", 2.0)
+    assert fred_store.as_of("MONTHLY", "2000-03-01") == ("2000-03-01", 2.0)
+    assert fred_store.as_of("MONTHLY", "1999-12-31") is None
+
+
+def test_as_of_drops_stale_observations(series):
+    assert fred_store.as_of("MONTHLY", "2001-01-10") == ("2000-12-01", 11.0)
+    assert fred_store.as_of("MONTHLY", "2001-03-01") is None
+    assert fred_store.as_of("DAILY", "2000-01-31") == ("2000-01-31", 20.0)
+    assert fred_store.as_of("DAILY", "2000-02-20") is None
+
+
+def test_as_of_many_matches_as_of(series):
+    dates = np.arange(np.datetime64("1999-12-01"), np.datetime64("2001-04-01"), 9)
+    for series_id in ("MONTHLY", "DAILY"):
+        observed, values = fred_store.as_of_many(series_id, dates)
+        for date, found, value in zip(dates, observed, values):
+            expected = fred_store.as_of(series_id, str(date))
+            if expected is None:
+                assert np.isnat(found) and np.isnan(value)
+            else:
+                assert (str(found), float(value)) == expected
@@ -0,0 +1,179 @@
+import hashlib
+import itertools
+import os
+import sys
+import threading
+import types
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+
+import build_cache
+import compact_json
+import fixtures
+import http_cache
+import http_client
+
+LAST_MODIFIED = "Wed, 01 Jan 2025 00:00:00 GMT"
+
+
+class Upstream(BaseHTTPRequestHandler):
+    """/etag/... validates with an ETag, /last-modified/... with Last-Modified; each body is its path"""
+
+    def do_GET(self):
+        self.server.requests.append((self.path, dict(self.headers)))
+        body = self.server.bodies.get(self.path, self.path).encode("utf-8")
+        if self.path.startswith("/etag/"):
+            validator = ("ETag", f'"{hashlib.sha256(body).hexdigest()[:16]}"')
+            not_modified = self.headers.get("If-None-Match") == validator[1]
+        else:
+            validator = ("Last-Modified", LAST_MODIFIED)
+            not_modified = self.headers.get("If-Modified-Since") == LAST_MODIFIED and self.path not in self.server.bodies
+
+        self.send_response(304 if not_modified else 200)
+        self.send_header(*validator)
+        if not_modified:
+            self.end_headers()
+            return
+        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def upstream():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Upstream)
+    server.requests = []
+    server.bodies = {}  # path -> body overriding the default (and, for Last-Modified, forcing a 200)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server, f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    """The process-wide client, with its cache in tmp_path and no rate limit"""
+    monkeypatch.setattr(fixtures, "MODE", None)
+    monkeypatch.setattr(build_cache, "FORCE", False)
+    monkeypatch.setattr(http_client, "DEFAULT_RATE_LIMIT", 0)
+    client = http_client.HttpClient(cache=http_cache.ResponseCache(str(tmp_path / "http")))
+    monkeypatch.setattr(http_client, "_client", client)
+    return client
+
+
+@pytest.mark.parametrize("path, header", [("/etag/a", "If-None-Match"), ("/last-modified/a", "If-Modified-Since")])
+def test_conditional_get_round_trip(upstream, client, path, header):
+    server, base = upstream
+    url = base + path
+
+    first = client.get(url)
+    assert first.text == path and not first.from_cache
+    assert header not in server.requests[0][1]
+
+    second = client.get(url)
+    assert second.status_code == 200
+    assert second.text == path and second.from_cache
+    assert second.encoding == first.encoding
+    assert server.requests[1][1][header]
+    assert client.modified[url] is False
+    assert client.body_hashes[url] == hashlib.sha256(path.encode("utf-8")).hexdigest()
+
+    # A new body upstream is served in full and replaces the cached one
+    server.bodies[path] = "changed"
+    third = client.get(url)
+    assert third.text == "changed" and not third.from_cache
+    assert client.modified[url] is True
+    server.bodies.pop(path)
+    if path.startswith("/etag/"):
+        assert client.get(url).text == path
+
+
+def test_response_without_validators_is_not_cached(tmp_path):
+    cache = http_cache.ResponseCache(str(tmp_path))
+    response = requests.Response()
+    response.status_code = 200
+    response._content = b"no validators"
+    cache.store("http://example.test/plain", response)
+    assert cache.validators("http://example.test/plain") == {}
+    assert cache.load("http://example.test/plain") is None
+
+
+def cached_response(body):
+    response = requests.Response()
+    response.status_code = 200
+    response._content = body
+    response.headers["ETag"] = f'"{len(body)}"'
+    return response
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path, monkeypatch):
+    clock = itertools.count(1000)
+    monkeypatch.setattr(http_cache, "time", types.SimpleNamespace(time=lambda: next(clock)))
+    cache = http_cache.ResponseCache(str(tmp_path), max_bytes=25)
+
+    cache.store("http://example.test/a", cached_response(b"a" * 10))
+    cache.store("http://example.test/b", cached_response(b"b" * 10))
+    assert cache.load("http://example.test/a")[1] == b"a" * 10  # a is now used after b
+
+    cache.store("http://example.test/c", cached_response(b"c" * 10))
+    assert cache.load("http://example.test/b") is None
+    assert cache.validators("http://example.test/b") == {}
+    assert cache.load("http://example.test/a") is not None
+    assert cache.load("http://example.test/c") is not None
+    assert len(os.listdir(tmp_path)) == 4  # meta + body of a and c
+
+    # An entry larger than the whole budget does not stay
+    cache.store("http://example.test/d", cached_response(b"d" * 30))
+    assert cache.load("http://example.test/d") is None
+
+
+def build(urls, output_file, script):
+    """What a fetcher does: fetch, skip on an unchanged upstream, otherwise write with the hashes"""
+    bodies = [http_client.get_text(url) for url in urls]
+    hashes = http_client.upstream_hashes(urls, script)
+    http_client.skip_if_unchanged(urls, output_file, hashes)
+    result = build_cache.record({"metadata": {}, "bodies": bodies}, hashes)
+    compact_json.write_json(result, output_file, compress=False, verbose=False)
+
+
+def test_all_304_rebuilds_a_missing_or_stale_output(upstream, client, tmp_path):
+    server, base = upstream
+    urls = [f"{base}/etag/x", f"{base}/last-modified/y"]
+    output_file = str(tmp_path / "output.json")
+    script = tmp_path / "fetch_example.py"
+    script.write_text("VERSION = 1\n")
+
+    build(urls, output_file, str(script))  # first fetch: 200s
+    os.remove(output_file)
+
+    # Every URL revalidates as 304, but the output is missing: rebuilt from the cached bodies
+    build(urls, output_file, str(script))
+    assert server.requests[-1][1].get("If-Modified-Since") == LAST_MODIFIED
+    assert not any(client.modified[url] for url in urls)
+    assert compact_json.read_json(output_file)["bodies"] == ["/etag/x", "/last-modified/y"]
+
+    # Same 304s, same bodies, same script: skipped
+    with pytest.raises(http_client.UpstreamUnchanged):
+        build(urls, output_file, str(script))
+
+    # An output built by an older script is rebuilt
+    script.write_text("VERSION = 2\n")
+    build(urls, output_file, str(script))
+    with pytest.raises(http_client.UpstreamUnchanged):
+        build(urls, output_file, str(script))
+
+    # An output left behind by another run (different bodies recorded) is rebuilt
+    result = compact_json.read_json(output_file)
+    result["metadata"][build_cache.INPUTS_KEY]["upstream"] = "0" * 64
+    compact_json.write_json(result, output_file, compress=False, verbose=False)
+    build(urls, output_file, str(script))
+    assert compact_json.read_json(output_file)["metadata"][build_cache.INPUTS_KEY]["upstream"] != "0" * 64
@@ -0,0 +1,134 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+
+import fred_store
+import recession_score
+
+# Points in the page's shape (RecessionIndicators.jsx) with their scores worked
+# out by hand from the page's formulas: (rounded score, component scores)
+PAGE_POINTS = [
+    (
+        "2007 pre-crisis scenario (backtest.py)",
+        {
+            "yield_curve": {"inverted_rate": 0.4, "avg_spread": -0.2},
+            "pmi": {"avg_value": 51.5, "contraction_rate": 0.15},
+            "credit_spreads": {"avg_spread": 180, "high_risk_rate": 0.15},
+            "consumer_confidence": {"avg_value": -5.0},
+            "unemployment_claims": {"avg_stress": 8.0, "high_risk_rate": 0.1},
+            "big_mac": {"avg_stress": 22.0}
+        },
+        # (180-100)/4 + 0.15*40 = 26; 10 + 5*3.5 = 27.5; 8*3 = 24; 22/60*100 = 36.7
+        14, {"yield": 0.0, "pmi": 0.0, "spreads": 26.0, "confidence": 27.5, "claims": 24.0, "bigmac": 36.7}
+    ),
+    (
+        "2008 crisis scenario (backtest.py)",
+        {
+            "yield_curve": {"inverted_rate": 0.8, "avg_spread": -1.5},
+            "pmi": {"avg_value": 38.0, "contraction_rate": 0.95},
+            "credit_spreads": {"avg_spread": 650, "high_risk_rate": 0.9},
+            "consumer_confidence": {"avg_value": -45.0},
+            "unemployment_claims": {"avg_stress": 60.0, "high_risk_rate": 0.8},
+            "big_mac": {"avg_stress": 45.0}
+        },
+        # 0.3*2*70 + min(30, 1.0*30) = 72; every other component capped at 100 but Big Mac (75)
+        89, {"yield": 72.0, "pmi": 100.0, "spreads": 100.0, "confidence": 100.0, "claims": 100.0, "bigmac": 75.0}
+    ),
+    (
+        "moderate stress, below every cap",
+        {
+            "yield_curve": {"inverted_rate": 0.75, "avg_spread": -0.9},
+            "pmi": {"avg_value": 47.0, "contraction_rate": 0.5},
+            "credit_spreads": {"avg_spread": 300, "high_risk_rate": 0.05},
+            "consumer_confidence": {"avg_value": -12.0},
+            "unemployment_claims": {"avg_stress": 15.0, "high_risk_rate": 0.3},
+            "big_mac": {"avg_stress": 30.0}
+        },
+        # 0.25*140 + 0.4*30 = 47; 3*10 + 0.5*25 = 42.5; 200/4 = 50; 10 + 42 = 52; 45 + 9 = 54; 50
+        48, {"yield": 47.0, "pmi": 42.5, "spreads": 50.0, "confidence": 52.0, "claims": 54.0, "bigmac": 50.0}
+    )
+]
+
+
+def business_days(start, end):
+    return [str(day) for day in np.arange(np.datetime64(start), np.datetime64(end)) if np.is_busday(day)]
+
+
+@pytest.fixture
+def history(monkeypatch):
+    """US series served from memory; high yield spreads only start in 1997"""
+    months = np.arange(np.datetime64("1985-01", "M"), np.datetime64("2000-01", "M"))
+    weeks = np.arange(np.datetime64("1985-01-05"), np.datetime64("2000-01-01"), 7)
+    series = {
+        "DGS10": business_days("1985-01-01", "2000-01-01"),
+        "DGS2": business_days("1985-01-01", "2000-01-01"),
+        "BAMLH0A0HYM2": business_days("1997-01-01", "2000-01-01"),
+        "CSCICP02USAM460S": [f"{month}-01" for month in months],
+        "ICSA": [str(week) for week in weeks]
+    }
+    monkeypatch.setattr(fred_store, "_series", {
+        series_id: (dates, [4.0 + (i % 10) / 10 for i in range(len(dates))])
+        for series_id, dates in series.items()
+    })
+    monkeypatch.setattr(fred_store, "_max_ages", {})
+    monkeypatch.setattr(fred_store, "prefetch", lambda series_ids: None)
+
+
+def test_inputs_at_masks_inputs_before_their_series_start(history):
+    dates = np.array(["1990-06-01", "1998-06-01"], dtype="datetime64[D]")
+    inputs, observed = recession_score.inputs_at(dates)
+
+    assert np.isnan(inputs["credit_spread"][0])
+    assert np.isnat(observed["BAMLH0A0HYM2"][0])
+    assert not np.isnan(inputs["credit_spread"][1])
+    assert observed["BAMLH0A0HYM2"][1] <= dates[1]
+    for series_id, found in observed.items():
+        assert np.all(np.isnat(found) | (found <= dates)), series_id
+
+
+def test_inputs_at_needs_a_year_of_claims(history):
+    dates = np.array(["1985-06-01", "1986-06-01"], dtype="datetime64[D]")
+    inputs, _ = recession_score.inputs_at(dates)
+    assert np.isnan(inputs["claims_stress"][0])
+    assert not np.isnan(inputs["claims_stress"][1])
+
+
+@pytest.mark.parametrize("name, point, expected_score, expected_components", PAGE_POINTS,
+                         ids=[point[0] for point in PAGE_POINTS])
+def test_score_point_matches_page_model(name, point, expected_score, expected_components):
+    score, components = recession_score.score_point(point)
+    assert score == expected_score
+    assert components == expected_components
+
+
+def test_weighted_score_page_calculation_example():
+    # The methodology box: 60, 75, 40, 55, 30 and 25 with the page's weights
+    components = {name: np.array([value]) for name, value in
+                  zip(recession_score.WEIGHTS, (60.0, 75.0, 40.0, 55.0, 30.0, 25.0))}
+    assert recession_score.weighted_score(components)[0] == pytest.approx(52.75)
+
+
+def test_weighted_score_renormalizes_missing_components():
+    nan = np.nan
+    components = {
+        "yield": np.array([60.0, nan, 150.0]),
+        "pmi": np.array([nan, nan, nan]),
+        "spreads": np.array([40.0, nan, nan]),
+        "confidence": np.array([nan, nan, nan]),
+        "claims": np.array([nan, nan, nan]),
+        "bigmac": np.array([nan, nan, nan])
+    }
+    scores = recession_score.weighted_score(components)
+    assert scores[0] == pytest.approx((60 * 0.30 + 40 * 0.15) / 0.45)
+    assert np.isnan(scores[1])
+    assert scores[2] == 100
+
+
+def test_trailing_mean_needs_a_full_window_without_gaps():
+    values = np.array([1.0, 2.0, np.nan, 4.0, 5.0, 6.0])
+    expected = np.array([np.nan, np.nan, 1.5, np.nan, np.nan, 4.5])
+    np.testing.assert_allclose(recession_score.trailing_mean(values, 2), expected, equal_nan=True)
@@ -0,0 +1,81 @@
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+
+import recession_score
+import recession_sweep
+
+
+def history_inputs(length=240, seed=0):
+    """Level series shaped like monthly_history's output, with some gaps"""
+    rng = np.random.default_rng(seed)
+    inputs = {
+        "yield_spread": rng.normal(0.5, 1.2, length),
+        "credit_spread": rng.normal(450, 200, length),
+        "confidence": rng.normal(-5, 10, length),
+        "claims_stress": rng.normal(5, 20, length)
+    }
+    for values in inputs.values():
+        values[rng.random(length) < 0.1] = np.nan
+    return inputs
+
+
+def test_sweep_default_combo_matches_model(tmp_path):
+    inputs = history_inputs()
+    inputs_file = str(tmp_path / "inputs.npy")
+    recession_sweep.save_inputs(inputs, inputs_file)
+    recession_sweep._init_worker(inputs_file, [])
+
+    swept, swept_components = recession_score.score(
+        recession_sweep._inputs, recession_sweep.to_params(recession_sweep.DEFAULT_COMBO))
+    expected, expected_components = recession_score.score(inputs)
+
+    np.testing.assert_allclose(swept, expected, equal_nan=True)
+    for name, values in expected_components.items():
+        np.testing.assert_allclose(swept_components[name], values, equal_nan=True)
+
+
+def test_sweep_thresholds_change_scores(tmp_path):
+    inputs = history_inputs()
+    inputs_file = str(tmp_path / "inputs.npy")
+    recession_sweep.save_inputs(inputs, inputs_file)
+    recession_sweep._init_worker(inputs_file, [])
+
+    scores = []
+    for credit_high_risk in (400, 700):
+        combo = dict(recession_sweep.DEFAULT_COMBO, credit_high_risk=credit_high_risk)
+        scores.append(recession_score.score(recession_sweep._inputs, recession_sweep.to_params(combo))[0])
+    assert not np.allclose(scores[0], scores[1], equal_nan=True)
+
+
+def test_recession_windows_keeps_peaks_inside_the_history():
+    months = np.arange("2006-01", "2011-01", dtype="datetime64[M]")
+    # 2001 peaks before the history and 2020 after it; 2007-12 is month 23, 2009-06 month 41
+    assert recession_sweep.recession_windows(months) == [(11, 23, 41)]
+
+
+def test_evaluate_hand_built_alarm_series():
+    # Two recessions: warning window [3, 15] ending in trough 18, and [23, 35] ending in trough 38
+    windows = [(3, 15, 18), (23, 35, 38)]
+    scores = np.zeros(40)
+    scores[0:2] = 80      # episode before any window: false positive
+    scores[6:21] = 60     # starts 9 months before the first peak and runs past the trough: one hit
+    scores[22:25] = 70    # starts a month before the second window: false positive, still warns at 23
+    scores[30] = np.nan   # missing months never alarm
+    scores[32] = 50       # exactly at the threshold, inside the second window: not false
+    hits, lead, false_positives = recession_sweep.evaluate(scores, 50, windows)
+    assert hits == 2
+    assert lead == (9 + 12) / 2
+    assert false_positives == 2
+
+
+def test_evaluate_missed_recession_and_no_alarms():
+    windows = [(3, 15, 18), (23, 35, 38)]
+    scores = np.full(40, 20.0)
+    scores[14] = 55       # a month before the first peak
+    scores[36:39] = 55    # after the second peak: inside its window, but too late to warn
+    assert recession_sweep.evaluate(scores, 50, windows) == (1, 1.0, 0)
+    assert recession_sweep.evaluate(np.full(40, np.nan), 50, windows) == (0, None, 0)
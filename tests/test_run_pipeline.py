@@ -0,0 +1,112 @@
+import os
+import subprocess
+import sys
+import time
+import types
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+
+import run_pipeline
+
+
+@pytest.fixture
+def fake_jobs(monkeypatch, tmp_path):
+    """
+    Jobs run as stub processes sleeping durations[name] seconds, then exiting
+    with exit_codes[name] (default 0)
+    Also records the start order and, per job, which jobs were still running when it started
+    """
+    fake = types.SimpleNamespace(exit_codes={}, durations={}, started=[], running_at_start={})
+    processes = {}
+    monkeypatch.setattr(run_pipeline, "DATA_DIR", str(tmp_path / "data"))
+    monkeypatch.setattr(run_pipeline, "POLL_INTERVAL", 0.01)
+    monkeypatch.setattr(run_pipeline, "print_job_log", lambda name, log_path: None)
+
+    def start_job(job, extra_args):
+        name = job["name"]
+        fake.started.append(name)
+        fake.running_at_start[name] = [other for other, process in processes.items() if process.poll() is None]
+        log_path = str(tmp_path / f"{name}.log")
+        code = fake.exit_codes.get(name, 0)
+        duration = fake.durations.get(name, 0)
+        processes[name] = subprocess.Popen(
+            [sys.executable, "-c", f"import sys, time; time.sleep({duration}); sys.exit({code})"])
+        return {
+            "process": processes[name],
+            "log": open(log_path, "w", encoding="utf-8"),
+            "log_path": log_path,
+            "started": time.monotonic(),
+            "mtimes": run_pipeline.output_mtimes(job)
+        }
+
+    monkeypatch.setattr(run_pipeline, "start_job", start_job)
+    return fake
+
+
+def job(name, inputs=(), outputs=(), **options):
+    # A real script, so is_cached can hash it
+    return {"name": name, "script": "build_manifest.py", "inputs": list(inputs), "outputs": list(outputs), **options}
+
+
+def statuses(results):
+    return {result["name"]: result["status"] for result in results}
+
+
+def test_failed_bonds_skips_both_derived_jobs(fake_jobs):
+    fake_jobs.exit_codes["bonds"] = 1
+
+    results = statuses(run_pipeline.run_jobs(run_pipeline.JOBS, workers=4))
+
+    assert results["bonds"] == "failed"
+    assert results["yield_curve"] == "skipped"
+    assert results["credit_spreads"] == "skipped"
+    assert "yield_curve" not in fake_jobs.started and "credit_spreads" not in fake_jobs.started
+
+
+def test_failure_skips_dependents_transitively_and_runs_independent_jobs(fake_jobs):
+    jobs = [
+        job("source", outputs=["source.json"]),
+        job("derived", inputs=["source.json"], outputs=["derived.json"]),
+        job("report", inputs=["derived.json", "other.json"], outputs=["report.json"]),
+        job("other", outputs=["other.json"]),
+        job("sibling", inputs=["other.json"], outputs=["sibling.json"])
+    ]
+    fake_jobs.exit_codes["source"] = 3
+    fake_jobs.durations["other"] = 0.2
+
+    results = {result["name"]: result for result in run_pipeline.run_jobs(jobs, workers=4)}
+
+    assert statuses(results.values()) == {
+        "source": "failed",
+        "derived": "skipped",
+        "report": "skipped",
+        "other": "ok",
+        "sibling": "ok"
+    }
+    assert results["source"]["exit_code"] == 3
+    assert results["derived"]["reason"] == "upstream failed: source"
+    assert results["report"]["reason"] == "upstream failed: derived"
+    assert sorted(fake_jobs.started) == ["other", "sibling", "source"]
+    # Dependents start only after their inputs are built
+    assert fake_jobs.started.index("sibling") > fake_jobs.started.index("other")
+    assert "other" not in fake_jobs.running_at_start["sibling"]
+
+
+def test_after_all_job_runs_last_even_after_a_failure(fake_jobs):
+    jobs = [
+        job("manifest", after_all=True),
+        job("fast", outputs=["fast.json"]),
+        job("slow", outputs=["slow.json"]),
+        job("broken", outputs=["broken.json"]),
+        job("derived", inputs=["broken.json"], outputs=["derived.json"])
+    ]
+    fake_jobs.durations["slow"] = 0.3
+    fake_jobs.exit_codes["broken"] = 1
+
+    results = statuses(run_pipeline.run_jobs(jobs, workers=4))
+
+    assert results == {"manifest": "ok", "fast": "ok", "slow": "ok", "broken": "failed", "derived": "skipped"}
+    assert fake_jobs.started[-1] == "manifest"
+    assert fake_jobs.running_at_start["manifest"] == []